@@ -36,7 +36,7 @@ class CooldownPreset:
         await view.respond_with_view(inter, ephemeral=True)
 
     async def describe(self, inter: discord.Interaction, entity_id: int) -> None:
-        cooldown = get_current_cooldown(self.entity, entity_id)
+        cooldown = await get_current_cooldown(self.entity, entity_id)
 
         if cooldown:
             if cooldown.exact_ends_at:
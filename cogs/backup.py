@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import time
 from pathlib import Path
@@ -6,10 +7,10 @@ import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 
-from db import EngineProvider, SQLITE_FILE_NAME
+from db import EngineProvider, snapshots
 from services.disc import CheckDeferringBehaviour, post_raw_text, requires_permission, respond, send_developers
 from config.stage_parameters import get_value as get_stage_parameter_value
-from util.format import as_timestamp, TimestampStyle
+from util.format import as_file_size, as_link, as_timestamp, TimestampStyle
 from util.identifiers import PermissionFlagID, StageParameterID, TextPieceID
 
 
@@ -25,13 +26,24 @@ class BackupCog(commands.GroupCog, name="backup", description="Commands for mana
 
     @staticmethod
     async def backup(manual: bool) -> None:
-        time_now = time.time()
-        absolute_time = as_timestamp(time_now, TimestampStyle.LONG_DATETIME)
-        relative_time = as_timestamp(time_now, TimestampStyle.RELATIVE)
-        backup_type = 'manual' if manual else 'regular'
-        message_text = f'BACKUP {absolute_time} ({relative_time}) - {backup_type}'
-        await post_raw_text(get_stage_parameter_value(StageParameterID.SNAPSHOT_CHANNEL_ID), message_text, file_path=SQLITE_FILE_NAME)
-        await send_developers(message_text, file_path=SQLITE_FILE_NAME)
+        async with EngineProvider.snapshot_lock:  # A manual backup may race the regular one or a /backup load
+            time_now = time.time()
+            absolute_time = as_timestamp(time_now, TimestampStyle.LONG_DATETIME)
+            relative_time = as_timestamp(time_now, TimestampStyle.RELATIVE)
+            backup_type = 'manual' if manual else 'regular'
+            snapshot = await EngineProvider.take_snapshot(force_full=manual)
+            snapshot_kind = 'full' if snapshot.is_full else 'changeset'
+            snapshot_details = f'{snapshot_kind}, {as_file_size(snapshot.size)} (uncompressed: {as_file_size(snapshot.raw_size)}), taken in {snapshot.duration.total_seconds():.2f} s'
+            message_text = f'BACKUP {absolute_time} ({relative_time}) - {backup_type}\n{snapshot_details}\n{snapshot.describe_checksums()}'
+            try:
+                message = await post_raw_text(get_stage_parameter_value(StageParameterID.SNAPSHOT_CHANNEL_ID), message_text, file_path=str(snapshot.path))
+            except Exception:
+                snapshots.discard_pending()
+                raise
+            finally:
+                snapshot.path.unlink()
+            snapshots.commit_snapshot(snapshot, message.id, message.created_at)
+        await send_developers(f'{message_text}\n{as_link(message.jump_url, snapshot.path.name)}')
 
     @tasks.loop(time=datetime.time(hour=1, tzinfo=datetime.UTC))
     async def my_task(self) -> None:
@@ -47,9 +59,16 @@ class BackupCog(commands.GroupCog, name="backup", description="Commands for mana
     @app_commands.describe(file=TextPieceID.COMMAND_OPTION_BACKUP_LOAD_FILE.as_locale_str())
     @requires_permission(PermissionFlagID.ADMIN, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def load(self, inter: discord.Interaction, file: discord.Attachment) -> None:
-        downloaded_file_path = Path('data/new.db')
-        await file.save(downloaded_file_path)
-        await EngineProvider.replace_file(downloaded_file_path)
+        downloaded_file_path = Path('data') / f'new_{file.filename}'
+        new_db_path = Path('data/new.db')
+        try:
+            await file.save(downloaded_file_path)
+            await asyncio.to_thread(snapshots.unpack, downloaded_file_path, new_db_path)
+            await EngineProvider.replace_file(new_db_path)
+        finally:
+            # On success replace_file() has already moved the unpacked file away
+            downloaded_file_path.unlink(missing_ok=True)
+            new_db_path.unlink(missing_ok=True)
         await respond(inter, TextPieceID.COMMON_SUCCESS)
 
 
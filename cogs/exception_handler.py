@@ -5,7 +5,7 @@ from discord.app_commands import CheckFailure
 from discord.ext import commands
 
 from main import RequestBot
-from services.disc import respond, respond_forbidden, send_developers
+from services.disc import respond, respond_forbidden, send_developers_in_background
 from util.format import as_code_block, as_user
 from util.identifiers import StageParameterID, TextPieceID
 from config.stage_parameters import get_value as get_stage_parameter_value
@@ -37,7 +37,7 @@ class ExceptionHandler(commands.Cog):
             except (discord.errors.InteractionResponded, discord.errors.NotFound, discord.errors.HTTPException):
                 pass
 
-            await send_developers(raw_error_message, "py")
+            send_developers_in_background(raw_error_message, "py")
 
 async def setup(bot: RequestBot):
     await bot.add_cog(ExceptionHandler(bot))
\ No newline at end of file
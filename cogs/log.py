@@ -17,7 +17,7 @@ from facades.eventlog import (
 from services.disc import CheckDeferringBehaviour, requires_permission, respond
 from util.datatypes import CommandChoiceOption
 from util.exceptions import AlreadySatisfiesError
-from util.format import as_code, list_values
+from util.format import as_code, as_user, list_values
 from util.identifiers import LoggedEventTypeID, PermissionFlagID, TextPieceID
 from dateutil.parser import parse as parse_datetime, ParserError
 
@@ -28,7 +28,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def restrict_user(self, inter: discord.Interaction, user: discord.Member):
         try:
-            update_filter_user(inter.user, user)
+            await update_filter_user(inter.user, user)
         except AlreadySatisfiesError:
             await respond(inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
         else:
@@ -40,7 +40,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def restrict_type(self, inter: discord.Interaction, event_type: LoggedEventTypeID):
         try:
-            update_filter_event_type(inter.user, event_type)
+            await update_filter_event_type(inter.user, event_type)
         except AlreadySatisfiesError:
             await respond(inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
         else:
@@ -54,7 +54,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def restrict_custom_field(self, inter: discord.Interaction, key: str, value: str):
         try:
-            update_filter_custom_field(inter.user, key, value)
+            await update_filter_custom_field(inter.user, key, value)
         except AlreadySatisfiesError:
             await respond(inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
         else:
@@ -64,7 +64,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def unrestrict_user(self, inter: discord.Interaction):
         try:
-            update_filter_user(inter.user, None)
+            await update_filter_user(inter.user, None)
         except AlreadySatisfiesError:
             await respond(inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
         else:
@@ -74,7 +74,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def unrestrict_type(self, inter: discord.Interaction):
         try:
-            update_filter_event_type(inter.user, None)
+            await update_filter_event_type(inter.user, None)
         except AlreadySatisfiesError:
             await respond(inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
         else:
@@ -85,7 +85,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def unrestrict_custom_field(self, inter: discord.Interaction, key: str):
         try:
-            update_filter_custom_field(inter.user, key, None)
+            await update_filter_custom_field(inter.user, key, None)
         except AlreadySatisfiesError:
             await respond(inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
         else:
@@ -95,7 +95,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def clear_custom_field_restrictions(self, inter: discord.Interaction):
         try:
-            clear_filter_custom_fields(inter.user)
+            await clear_filter_custom_fields(inter.user)
         except AlreadySatisfiesError:
             await respond(inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
         else:
@@ -105,7 +105,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def clear_filter(self, inter: discord.Interaction):
         try:
-            clear_current_filter(inter.user)
+            await clear_current_filter(inter.user)
         except AlreadySatisfiesError:
             await respond(inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
         else:
@@ -115,14 +115,13 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @app_commands.describe(name=TextPieceID.COMMAND_OPTION_LOG_DESCRIBE_FILTER_NAME.as_locale_str())
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def describe_filter(self, inter: discord.Interaction, name: str | None = None):
-        log_filter = get_filter(name) if name else get_current_filter(inter.user)
+        log_filter = await get_filter(name) if name else await get_current_filter(inter.user)
 
         if log_filter and not log_filter.is_empty():
             filter_dict = {}
 
             if log_filter.user_id:
-                user = await inter.client.fetch_user(log_filter.user_id)
-                filter_dict["user"] = user.mention
+                filter_dict["user"] = as_user(log_filter.user_id)
 
             if log_filter.event_type:
                 filter_dict["event"] = as_code(log_filter.event_type.name)
@@ -154,9 +153,9 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @app_commands.command(description=TextPieceID.COMMAND_DESCRIPTION_LOG_LIST_FILTERS.as_locale_str())
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def list_filters(self, inter: discord.Interaction):
-        filters = list_filters()
+        filters = await list_filters()
         if filters:
-            await respond(inter, list_values(list_filters()), ephemeral=True)
+            await respond(inter, list_values(await list_filters()), ephemeral=True)
         else:
             await respond(inter, TextPieceID.LOG_NO_FILTERS, ephemeral=True)
 
@@ -165,7 +164,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @requires_permission(PermissionFlagID.LOG_VIEWER, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def select_filter(self, inter: discord.Interaction, name: str):
         try:
-            select_filter(inter.user, name)
+            await select_filter(inter.user, name)
         except NotExistsError:
             await respond(inter, TextPieceID.ERROR_FILTER_DOESNT_EXIST, substitutions=dict(name=name), ephemeral=True)
         else:
@@ -175,17 +174,17 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     @app_commands.describe(name=TextPieceID.COMMAND_OPTION_LOG_SAVE_FILTER_NAME.as_locale_str())
     @requires_permission(PermissionFlagID.ADMIN, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def save_filter(self, inter: discord.Interaction, name: str):
-        log_filter = get_current_filter(inter.user)
+        log_filter = await get_current_filter(inter.user)
 
         if not log_filter or log_filter.is_empty():
             await respond(inter, TextPieceID.LOG_EMPTY_FILTER_WONT_BE_SAVED, ephemeral=True)
             return
 
         try:
-            save_filter(name, log_filter)
+            await save_filter(name, log_filter)
         except AlreadyExistsError:
-            def on_confirmed(_) -> None:
-                save_filter(name, log_filter, force=True)
+            async def on_confirmed(_) -> None:
+                await save_filter(name, log_filter, force=True)
             await ConfirmationView().respond_with_view(inter, True, on_confirmed, TextPieceID.CONFIRMATION_OVERRIDE_FILTER, dict(name=name))
         else:
             await respond(inter, TextPieceID.COMMON_SUCCESS, ephemeral=True)
@@ -196,7 +195,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     async def delete_filter(self, inter: discord.Interaction, name: str):
         async def on_confirmed(following_inter: discord.Interaction) -> None:
             try:
-                delete_filter(name)
+                await delete_filter(name)
             except AlreadySatisfiesError:
                 await respond(following_inter, TextPieceID.WARNING_NO_EFFECT, ephemeral=True)
             else:
@@ -208,7 +207,7 @@ class LogCog(commands.GroupCog, name="log", description="Commands for querying l
     async def name_autocomplete(self, _: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
         return [
             app_commands.Choice(name=option, value=option)
-            for option in find_filters_by_prefix(current)[:25]
+            for option in (await find_filters_by_prefix(current))[:25]
             if option.lower().startswith(current.lower())
         ]
 
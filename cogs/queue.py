@@ -1,17 +1,43 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from components.views.pagination.log import LogPaginationView
+from db import TooEarlyException
 from facades.eventlog import LoadedLogFilter
 from facades.parameters import get_value as get_parameter_value, update_value as update_parameter_value
-from facades.requests import count_pending_requests
+from facades.requests import count_pending_requests, reconcile_pending_count
 from services.disc import CheckDeferringBehaviour, post_raw_text, requires_permission, respond
 from util.exceptions import AlreadySatisfiesError
 from util.identifiers import LoggedEventTypeID, ParameterID, PermissionFlagID, RouteID, TextPieceID
 
 
+PENDING_COUNT_RECONCILE_INTERVAL_MINUTES = 15
+
+
 class QueueCog(commands.GroupCog, name="queue", description="Commands for controlling request queue"):
+    def __init__(self, bot) -> None:
+        self.bot = bot
+
+    async def cog_load(self) -> None:
+        self.reconcile_task.start()
+
+    async def cog_unload(self) -> None:
+        self.reconcile_task.stop()
+
+    @tasks.loop(minutes=PENDING_COUNT_RECONCILE_INTERVAL_MINUTES)
+    async def reconcile_task(self) -> None:
+        try:
+            drift = await reconcile_pending_count()
+        except TooEarlyException:
+            return  # The database is loaded in on_ready, which may still be running; the next iteration will catch up
+        if drift:
+            self.bot.logger.warning(f'Pending request counter drifted by {drift}, reconciled')
+
+    @reconcile_task.before_loop
+    async def before_reconcile_task(self) -> None:
+        await self.bot.wait_until_ready()
+
     @app_commands.command(description=TextPieceID.COMMAND_DESCRIPTION_QUEUE_OPEN.as_locale_str())
     @requires_permission(PermissionFlagID.ADMIN, CheckDeferringBehaviour.DEFER_EPHEMERAL)
     async def open(self, inter: discord.Interaction) -> None:
@@ -4,6 +4,7 @@ from discord.ext import commands
 from discord.ui import Button, View
 
 from components.modals.request_submission import RequestSubmissionModal
+from db.models import Request
 from facades.parameters import get_value as get_parameter_value
 from facades.cooldowns import get_current_cooldown_eagerly
 from facades.permissions import has_permission
@@ -16,11 +17,12 @@ from facades.requests import (
     get_oldest_unresolved_request,
     InvalidYtLinkException,
     LevelAlreadyApprovedException,
+    mark_details_messages_deleted,
     NotFoundException, PreviousLevelRequestPendingException,
 )
 from facades.texts import render_text
-from services.disc import CheckDeferringBehaviour, find_message, member_language, requires_permission, respond, safe_send_modal
-from services.gd import get_level, LevelGrade, LevelLength
+from services.disc import CheckDeferringBehaviour, confirm_messages_exist, get_message_url, member_language, requires_permission, respond, safe_send_modal
+from services.gd import get_level, LevelFieldClass, LevelGrade, LevelLength
 from util.datatypes import CommandChoiceOption, CooldownEntity, Language
 from util.format import as_code, as_link, as_timestamp, as_user
 from util.identifiers import ParameterID, PermissionFlagID, StageParameterID, TextPieceID
@@ -30,14 +32,14 @@ from config.stage_parameters import get_value as get_stage_parameter_value
 class RequestCog(commands.GroupCog, name="request", description="Commands for managing requests"):
     @staticmethod
     async def check_request_cooldown(inter: Interaction, entity: CooldownEntity, entity_id: int, level_name: str | None = None) -> bool:
-        current_cd_info = get_current_cooldown_eagerly(entity, entity_id)
+        current_cd_info = await get_current_cooldown_eagerly(entity, entity_id)
         if not current_cd_info:
             return False
 
         current_cd = current_cd_info.cooldown
         if current_cd_info.causing_request:
             if entity == CooldownEntity.USER:
-                prev_level = await get_level(current_cd_info.causing_request.level_id)
+                prev_level = await get_level(current_cd_info.causing_request.level_id, LevelFieldClass.STABLE)
                 text_piece_id = TextPieceID.REQUEST_COMMAND_USER_ON_COOLDOWN
                 substitutions = dict(
                     ends_at=as_timestamp(current_cd.exact_ends_at),
@@ -87,7 +89,7 @@ class RequestCog(commands.GroupCog, name="request", description="Commands for ma
             return
 
         try:
-            assert_level_requestable(level_id)
+            await assert_level_requestable(level_id)
         except LevelAlreadyApprovedException as e:
             await respond(
                 inter,
@@ -153,28 +155,31 @@ class RequestCog(commands.GroupCog, name="request", description="Commands for ma
         # await inter.edit_original_response(content="", view=continue_view)
 
     @staticmethod
-    async def _make_widget_link_generic(channel_id: int | None, message_id: int | None, language: Language, link_text: TextPieceID, not_found_text: TextPieceID) -> str:
-        details_message = await find_message(channel_id, message_id)
-        if details_message:
-            return as_link(details_message.jump_url, render_text(link_text, language))
+    def _make_widget_link_generic(channel_id: int | None, message_id: int | None, language: Language, link_text: TextPieceID, not_found_text: TextPieceID) -> str:
+        if channel_id and message_id:
+            return as_link(get_message_url(channel_id, message_id), render_text(link_text, language))
         else:
             return render_text(not_found_text, language)
 
     @staticmethod
-    async def _make_reviewers_widget_link(channel_id: int | None, message_id: int | None, language: Language) -> str:
-        return await RequestCog._make_widget_link_generic(
-            channel_id,
-            message_id,
+    def _make_reviewers_widget_link(request: Request, language: Language) -> str:
+        if request.is_details_message_deleted:
+            return render_text(TextPieceID.REQUEST_INFO_REVIEWERS_WIDGET_NOT_FOUND, language)
+        if request.details_message_channel_id and request.details_message_id:
+            confirm_messages_exist({request.id: (request.details_message_channel_id, request.details_message_id)}, mark_details_messages_deleted)
+        return RequestCog._make_widget_link_generic(
+            request.details_message_channel_id,
+            request.details_message_id,
             language,
             TextPieceID.REQUEST_INFO_REVIEWERS_WIDGET_LINK_TEXT,
             TextPieceID.REQUEST_INFO_REVIEWERS_WIDGET_NOT_FOUND
         )
 
     @staticmethod
-    async def _make_moderators_widget_link(channel_id: int | None, message_id: int | None, language: Language) -> str:
-        return await RequestCog._make_widget_link_generic(
-            channel_id,
-            message_id,
+    def _make_moderators_widget_link(request: Request, language: Language) -> str:
+        return RequestCog._make_widget_link_generic(
+            request.resolution_message_channel_id,
+            request.resolution_message_id,
             language,
             TextPieceID.REQUEST_INFO_MODERATORS_WIDGET_LINK_TEXT,
             TextPieceID.REQUEST_INFO_MODERATORS_WIDGET_NOT_FOUND
@@ -192,11 +197,11 @@ class RequestCog(commands.GroupCog, name="request", description="Commands for ma
         user_lang = member_language(inter.user, inter.locale).language
         lines = [
             f"**Request {request.id}**",
-            await self._make_reviewers_widget_link(request.details_message_channel_id, request.details_message_id, user_lang)
+            self._make_reviewers_widget_link(request, user_lang)
         ]
         if request.resolution_message_channel_id and request.resolution_message_id:
             lines.append(
-                await self._make_moderators_widget_link(request.resolution_message_channel_id, request.resolution_message_id, user_lang)
+                self._make_moderators_widget_link(request, user_lang)
             )
 
         await respond(inter, lines, ephemeral=True)
@@ -212,7 +217,7 @@ class RequestCog(commands.GroupCog, name="request", description="Commands for ma
         user_lang = member_language(inter.user, inter.locale).language
         lines = [
             f"**Request {request.id}**",
-            await self._make_reviewers_widget_link(request.details_message_channel_id, request.details_message_id, user_lang)
+            self._make_reviewers_widget_link(request, user_lang)
         ]
         await respond(inter, lines, ephemeral=True)
 
@@ -227,7 +232,7 @@ class RequestCog(commands.GroupCog, name="request", description="Commands for ma
         user_lang = member_language(inter.user, inter.locale).language
         lines = [
             f"**Request {request.id}**",
-            await self._make_moderators_widget_link(request.resolution_message_channel_id, request.resolution_message_id, user_lang)
+            self._make_moderators_widget_link(request, user_lang)
         ]
         await respond(inter, lines, ephemeral=True)
 
@@ -257,7 +262,7 @@ class RequestCog(commands.GroupCog, name="request", description="Commands for ma
             return
 
         try:
-            assert_level_requestable(level_id)
+            await assert_level_requestable(level_id)
         except LevelAlreadyApprovedException as e:
             await respond(
                 inter,
@@ -3,8 +3,8 @@ from discord import app_commands, Member
 from discord.ext import commands
 
 from components.views.pagination.reviews import ReviewsPaginationView
-from facades.reviews import get_level_reviews
-from services.disc import find_message, respond, safe_defer
+from facades.reviews import get_level_reviews, mark_review_messages_deleted
+from services.disc import confirm_messages_exist, get_message_url, respond, safe_defer
 from util.format import as_link
 from util.identifiers import TextPieceID
 
@@ -17,12 +17,9 @@ class ReviewsCog(commands.GroupCog, name="reviews", description="Commands for ma
 
         reviews = await get_level_reviews(level_id)
 
-        response_lines = []
-        for review in reviews:
-            review_message = await find_message(review.message_channel_id, review.message_id)
-            if not review_message:
-                continue
-            response_lines.append(as_link(review_message.jump_url, str(review_message.id)))
+        present_reviews = [review for review in reviews if not review.is_message_deleted]
+        confirm_messages_exist({review.id: (review.message_channel_id, review.message_id) for review in present_reviews}, mark_review_messages_deleted)
+        response_lines = [as_link(get_message_url(review.message_channel_id, review.message_id), str(review.message_id)) for review in present_reviews]
 
         if not response_lines:
             await respond(inter, TextPieceID.REQUEST_NO_REVIEWS, ephemeral=True)
@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 from discord import Interaction
 from discord.ui import Modal
 
-from services.disc import send_developers
+from services.disc import send_developers_in_background
 
 
 class GenericModal(Modal, ABC):
@@ -28,5 +28,5 @@ class GenericModal(Modal, ABC):
 
     async def on_error(self, interaction: Interaction, error: Exception) -> None:
         error_details = "".join(traceback.format_exception(type(error), error, error.__traceback__))
-        await send_developers(error_details, "py")
+        send_developers_in_background(error_details, "py")
         self.stop()
\ No newline at end of file
@@ -4,9 +4,10 @@ from datetime import datetime
 
 from components.views.pagination.generic import GenericPaginationView
 from facades.eventlog import get_entries, LoadedLogFilter
-from facades.requests import get_request_by_id
-from services.disc import find_message
-from util.datatypes import CooldownEntity
+from facades.requests import get_request_by_id, mark_details_messages_deleted
+from services.disc import confirm_messages_exist, get_message_url
+from db.models import LoggedEvent
+from util.datatypes import CooldownEntity, PageCursor, Seek
 from util.format import as_code, as_link, as_timestamp, as_user, TimestampStyle
 from util.identifiers import LoggedEventTypeID
 
@@ -19,19 +20,38 @@ class CooldownHistoryPaginationView(GenericPaginationView):
         self.entity = entity
         self.entity_id = entity_id
 
-    async def get_current_page_blocks(self) -> list[str]:
+    async def fetch_entries(self, seek: Seek, limit: int) -> list[LoggedEvent]:
         event_type = LoggedEventTypeID.USER_COOLDOWN_UPDATED if self.entity == CooldownEntity.USER else LoggedEventTypeID.LEVEL_COOLDOWN_UPDATED
         entity_id_key = "target_user_id" if self.entity == CooldownEntity.USER else "target_level_id"
 
-        entries = get_entries(self.limit, self.offset, LoadedLogFilter(
+        return await get_entries(limit, seek, LoadedLogFilter(
             event_type=event_type,
             custom_data_values={
                 entity_id_key: self.entity_id
             }
         ))
 
+    def get_cursor(self, entry: LoggedEvent) -> PageCursor:
+        return PageCursor(entry.timestamp, entry.id)
+
+    @staticmethod
+    def _get_causing_request_id(event: LoggedEvent) -> int | None:
+        if event.user_id:
+            return None
+        request_id_matches = re.findall(r'\(request ID: (\d+)\)$', json.loads(event.custom_data).get("reason", "no reason"))
+        return int(request_id_matches[0]) if request_id_matches else None
+
+    async def render_entries(self, entries: list[LoggedEvent]) -> list[str]:
         blocks = []
 
+        causing_request_ids = {request_id for event in entries if (request_id := self._get_causing_request_id(event))}
+        details_message_references = {}
+        for request_id in causing_request_ids:
+            request = await get_request_by_id(request_id)
+            if request and request.details_message_channel_id and request.details_message_id and not request.is_details_message_deleted:
+                details_message_references[request_id] = (request.details_message_channel_id, request.details_message_id)
+        confirm_messages_exist(details_message_references, mark_details_messages_deleted)
+
         for event in entries:
             custom_data_dict = json.loads(event.custom_data)
             cast_timestamp = as_timestamp(event.timestamp)
@@ -47,16 +67,12 @@ class CooldownHistoryPaginationView(GenericPaginationView):
                 caster_ref = as_user(event.user_id)
                 if reason != "no reason":
                     caster_ref += f" ({reason})"
+            elif request_id := self._get_causing_request_id(event):
+                request_handle = f"**Request {request_id}**"
+                details_message_reference = details_message_references.get(request_id)
+                caster_ref = as_link(get_message_url(*details_message_reference), request_handle) if details_message_reference else request_handle
             else:
-                request_id_matches = re.findall(r'\(request ID: (\d+)\)$', reason)
-                if request_id_matches:
-                    request_id = int(request_id_matches[0])
-                    request = await get_request_by_id(request_id)
-                    request_handle = f"**Request {request_id}**"
-                    details_message = await find_message(request.details_message_channel_id, request.details_message_id)
-                    caster_ref = as_link(details_message.jump_url, request_handle) if details_message else request_handle
-                else:
-                    caster_ref = "SYSTEM"
+                caster_ref = "SYSTEM"
 
             blocks.append(f"{cast_timestamp} by {caster_ref}\n{cooldowns['old']} -> {cooldowns['new']}\n")
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from components.views.pagination.generic import GenericPaginationView
-from facades.cooldowns import list_endless_cooldowns
-from util.datatypes import CooldownEntity
+from facades.cooldowns import CooldownInfo, list_endless_cooldowns
+from util.datatypes import CooldownEntity, PageCursor, Seek
 from util.format import as_code, as_user
 
 
@@ -14,14 +14,19 @@ class EndlessCooldownPaginationView(GenericPaginationView):
 
         self.limit = 10
 
-    async def get_current_page_blocks(self) -> list[str]:
+    async def fetch_entries(self, seek: Seek, limit: int) -> list[CooldownInfo]:
+        return await list_endless_cooldowns(self.entity, limit, seek)
+
+    def get_cursor(self, entry: CooldownInfo) -> PageCursor:
+        return PageCursor(entry.casted_at, entry.entity_id)
+
+    async def render_entries(self, entries: list[CooldownInfo]) -> list[str]:
         lines = []
 
-        id_to_reason_mapping = list_endless_cooldowns(self.entity, self.limit, self.offset)
-        for entity_id, reason in id_to_reason_mapping.items():
-            line = as_user(entity_id) if self.entity == CooldownEntity.USER else as_code(entity_id)
-            if reason:
-                line += f" ({as_code(reason)})"
+        for info in entries:
+            line = as_user(info.entity_id) if self.entity == CooldownEntity.USER else as_code(info.entity_id)
+            if info.reason:
+                line += f" ({as_code(info.reason)})"
             lines.append(line)
 
         return lines
@@ -10,11 +10,13 @@ from discord import NotFound
 
 from services.disc import member_language, respond
 from facades.texts import render_text
+from util.datatypes import PageCursor, Seek, SeekDirection
 from util.format import as_code_block
 from util.identifiers import TextPieceID
 
 
 # No pagination persists after the bot's restart either. They are assumed to be single-use views
+# Pages are fetched by seeking from the (sort key, id) cursor of the first or last displayed entry rather than by offset
 class GenericPaginationView(ABC, discord.ui.View):
     def __init__(self) -> None:
         super().__init__(timeout=300)
@@ -23,8 +25,10 @@ class GenericPaginationView(ABC, discord.ui.View):
         self.user: discord.Member | None = None
         self.message: discord.Message | None = None
         self.message_text: str | None = None
-        self.offset = 0
         self.limit = 10
+        self.start_seek: Seek = Seek()
+        self.first_cursor: PageCursor | None = None
+        self.last_cursor: PageCursor | None = None
 
     async def shutdown(self) -> None:
         if self.message:
@@ -42,21 +46,43 @@ class GenericPaginationView(ABC, discord.ui.View):
         await self.shutdown()
 
     @abstractmethod
-    async def get_current_page_blocks(self) -> list[str]:
+    async def fetch_entries(self, seek: Seek, limit: int) -> list[tp.Any]:
         ...
 
+    @abstractmethod
+    def get_cursor(self, entry: tp.Any) -> PageCursor:
+        ...
+
+    @abstractmethod
+    async def render_entries(self, entries: list[tp.Any]) -> list[str]:
+        ...
+
+    async def _show_entries(self, entries: list[tp.Any]) -> list[str]:
+        if entries:
+            self.first_cursor = self.get_cursor(entries[0])
+            self.last_cursor = self.get_cursor(entries[-1])
+        return await self.render_entries(entries)
+
     async def respond_with_view(self, inter: discord.Interaction, ephemeral: bool) -> None:
         self.interaction = inter
         self.user = inter.user
 
-        self.prev.disabled = True
+        # One extra entry is requested to find out whether there is something beyond the page
+        entries = await self.fetch_entries(self.start_seek, self.limit + 1)
+        self.next.disabled = len(entries) <= self.limit
+        self.prev.disabled = self.start_seek.cursor is None
+        entries = entries[:self.limit]
 
-        blocks = await self.get_current_page_blocks()
+        # Processing the case when the starting point lies beyond the last entry
+        if not entries and self.start_seek.cursor:
+            entries = await self.fetch_entries(Seek(self.start_seek.cursor, SeekDirection.BEFORE), self.limit + 1)
+            self.prev.disabled = len(entries) <= self.limit
+            entries = entries[-self.limit:]
+
+        blocks = await self._show_entries(entries)
 
         if blocks:
             self.message_text = "\n".join(blocks)
-            if len(blocks) < self.limit:
-                self.next.disabled = True
         else:
             self.message_text = render_text(TextPieceID.PAGINATION_NO_ENTRIES, member_language(inter.user, inter.locale).language)
             self.prev.disabled = True
@@ -80,17 +106,18 @@ class GenericPaginationView(ABC, discord.ui.View):
         if self.user.id != inter.user.id:
             return
 
-        if self.offset > 0:
-            self.next.disabled = False
-
-        self.offset -= self.limit
+        self.next.disabled = False
 
-        if self.offset < 0:
-            self.offset = 0
+        entries = await self.fetch_entries(Seek(self.first_cursor, SeekDirection.BEFORE), self.limit + 1)
+        top_reached = len(entries) <= self.limit
+        if top_reached:
+            entries = await self.fetch_entries(Seek(), self.limit)
+        else:
+            entries = entries[-self.limit:]
 
-        blocks = await self.get_current_page_blocks()
+        blocks = await self._show_entries(entries)
         self.message_text = "\n".join(blocks)
-        if self.offset == 0:
+        if top_reached:
             note = render_text(TextPieceID.PAGINATION_TOP_REACHED, member_language(inter.user, inter.locale).language)
             self.message_text = f"**{note}**\n" + self.message_text
             button.disabled = True
@@ -105,17 +132,15 @@ class GenericPaginationView(ABC, discord.ui.View):
         if self.user.id != inter.user.id:
             return
 
-        self.offset += self.limit
-
-        blocks = await self.get_current_page_blocks()
+        entries = await self.fetch_entries(Seek(self.last_cursor, SeekDirection.AFTER), self.limit + 1)
+        bottom_reached = len(entries) <= self.limit
+        entries = entries[:self.limit]
 
-        if blocks:
-            self.message_text = "\n".join(blocks)
+        if entries:
+            self.message_text = "\n".join(await self._show_entries(entries))
             self.prev.disabled = False
-        else:
-            self.offset -= self.limit
 
-        if len(blocks) < self.limit:
+        if bottom_reached:
             note = render_text(TextPieceID.PAGINATION_BOTTOM_REACHED, member_language(inter.user, inter.locale).language)
             self.message_text += f"\n**{note}**"
             button.disabled = True
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from components.views.pagination.generic import GenericPaginationView
+from util.datatypes import PageCursor, Seek, SeekDirection
 
 
 class ListPaginationView(GenericPaginationView):
@@ -11,5 +12,15 @@ class ListPaginationView(GenericPaginationView):
 
         self.limit = limit
 
-    async def get_current_page_blocks(self) -> list[str]:
-        return self.paginated_list[self.offset:self.offset + self.limit]
+    async def fetch_entries(self, seek: Seek, limit: int) -> list[int]:
+        if seek.direction == SeekDirection.AFTER:
+            start = seek.cursor.id + 1 if seek.cursor else 0
+            return list(range(start, min(start + limit, len(self.paginated_list))))
+        end = seek.cursor.id if seek.cursor else len(self.paginated_list)
+        return list(range(max(end - limit, 0), end))
+
+    def get_cursor(self, entry: int) -> PageCursor:
+        return PageCursor(entry, entry)
+
+    async def render_entries(self, entries: list[int]) -> list[str]:
+        return [self.paginated_list[index] for index in entries]
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime
 from components.views.pagination.generic import GenericPaginationView
-from db.models import StoredLogFilter
-from facades.eventlog import get_current_filter, get_entries, get_offset_at_datetime, LoadedLogFilter
+from db.models import LoggedEvent, StoredLogFilter
+from facades.eventlog import get_current_filter, get_entries, LoadedLogFilter
+from services.disc import find_users
+from util.datatypes import PageCursor, Seek
 from util.format import as_code_block, logs_member_ref
 
 import json
@@ -14,34 +16,32 @@ class LogPaginationView(GenericPaginationView):
     def __init__(self, start_datetime: datetime | None = None, log_filter: StoredLogFilter | LoadedLogFilter | None = None) -> None:
         super().__init__()
 
-        self.may_require_step_back: bool = start_datetime is not None
         self.log_filter: StoredLogFilter | LoadedLogFilter | None = log_filter
 
         self.limit = 4
 
         if start_datetime:
-            self.offset = get_offset_at_datetime(start_datetime, self.log_filter)
+            # Ids start from 1, so the seek also includes the events logged exactly at the start datetime
+            self.start_seek = Seek(PageCursor(start_datetime, 0))
 
-    async def get_current_page_blocks(self) -> list[str]:
+    async def fetch_entries(self, seek: Seek, limit: int) -> list[LoggedEvent]:
         if not self.log_filter:
-            self.log_filter = get_current_filter(self.user)
+            self.log_filter = await get_current_filter(self.user)
 
-        entries = get_entries(self.limit, self.offset, self.log_filter)
+        return await get_entries(limit, seek, self.log_filter)
 
-        # Processing the case when the datetime exceeds the timestamp of the last matching event
-        if self.may_require_step_back and not entries and self.offset > 0:
-            self.offset = max(self.offset - self.limit, 0)
-            entries = get_entries(self.limit, self.offset, self.log_filter)
-
-        self.may_require_step_back = False
+    def get_cursor(self, entry: LoggedEvent) -> PageCursor:
+        return PageCursor(entry.timestamp, entry.id)
 
+    async def render_entries(self, entries: list[LoggedEvent]) -> list[str]:
         lines = []
+        users = await find_users(event.user_id for event in entries if event.user_id)
         for event in entries:
-            user = await self.interaction.client.fetch_user(event.user_id) if event.user_id else None
+            user = users.get(event.user_id)
             event_info = dict(
                 id=event.id,
                 event=event.event_type.name,
-                user=logs_member_ref(user),
+                user=logs_member_ref(user) if user or not event.user_id else str(event.user_id),
                 timestamp=event.timestamp.isoformat()
             )
             event_info.update(json.loads(event.custom_data))
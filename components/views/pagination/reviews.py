@@ -3,8 +3,9 @@ from __future__ import annotations
 from discord import Member
 
 from components.views.pagination.generic import GenericPaginationView
-from facades.reviews import get_user_reviews, UserReviewData
-from services.disc import find_message
+from facades.reviews import get_user_reviews, mark_review_messages_deleted, UserReviewData
+from services.disc import confirm_messages_exist, get_message_url
+from util.datatypes import PageCursor, Seek
 from util.format import as_link
 
 
@@ -17,12 +18,20 @@ class ReviewsPaginationView(GenericPaginationView):
         self.limit = 10
 
     @staticmethod
-    async def _render_block(review: UserReviewData) -> str:
-        review_message = await find_message(review.message_channel_id, review.message_id)
-        if review_message:
-            return as_link(review_message.jump_url, review.level_name)
-        return f"_{review.level_name} (deleted)_"
-
-    async def get_current_page_blocks(self) -> list[str]:
-        reviews = await get_user_reviews(self.author, self.limit, self.offset)
-        return [await self._render_block(review) for review in reviews]
+    def _render_block(review: UserReviewData) -> str:
+        if review.is_message_deleted:
+            return f"_{review.level_name} (deleted)_"
+        return as_link(get_message_url(review.message_channel_id, review.message_id), review.level_name)
+
+    async def fetch_entries(self, seek: Seek, limit: int) -> list[UserReviewData]:
+        return await get_user_reviews(self.author, limit, seek)
+
+    def get_cursor(self, entry: UserReviewData) -> PageCursor:
+        return entry.cursor
+
+    async def render_entries(self, entries: list[UserReviewData]) -> list[str]:
+        confirm_messages_exist(
+            {review.review_id: (review.message_channel_id, review.message_id) for review in entries if not review.is_message_deleted},
+            mark_review_messages_deleted
+        )
+        return [self._render_block(review) for review in entries]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from components.views.pagination.generic import GenericPaginationView
 from facades.cooldowns import list_temporary_cooldowns, CooldownInfo
-from util.datatypes import CooldownEntity
+from util.datatypes import CooldownEntity, PageCursor, Seek
 from util.format import as_code, as_timestamp, as_user
 
 
@@ -21,5 +21,11 @@ class TemporaryCooldownPaginationView(GenericPaginationView):
             line += f" ({as_code(info.reason)})"
         return line
 
-    async def get_current_page_blocks(self) -> list[str]:
-        return list(map(self._render_cooldown_line, list_temporary_cooldowns(self.entity, self.limit, self.offset)))
+    async def fetch_entries(self, seek: Seek, limit: int) -> list[CooldownInfo]:
+        return await list_temporary_cooldowns(self.entity, limit, seek)
+
+    def get_cursor(self, entry: CooldownInfo) -> PageCursor:
+        return PageCursor(entry.ends_at, entry.entity_id)
+
+    async def render_entries(self, entries: list[CooldownInfo]) -> list[str]:
+        return list(map(self._render_cooldown_line, entries))
@@ -1,18 +1,50 @@
 import asyncio
+import hashlib
+import sqlite3
 from dataclasses import dataclass
 from datetime import timedelta
 from pathlib import Path
-from typing import ClassVar
+from typing import Callable, ClassVar
 from db.models import *
+from db import snapshots
+import discord
+from alembic import command
+from alembic.config import Config
 from sqlmodel import SQLModel, create_engine, Session, text
-from sqlalchemy import Engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from config.stage_parameters import get_value as get_stage_parameter_value
 from globalconf import CONFIG
 from util.format import as_timestamp
 from util.identifiers import StageParameterID
 
 SQLITE_FILE_NAME = "data/database.db"
-SQLITE_URL = f"sqlite:///{SQLITE_FILE_NAME}"
+SWAPPED_SQLITE_FILE_NAME_PATTERN = "database.*.db*"  # Files put in place by replace_file; the startup restore always targets SQLITE_FILE_NAME
+MIGRATIONS_DIR = "migrations"
+ENGINE_DRAIN_TIMEOUT = timedelta(seconds=30)
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    journal_mode: str = "WAL"  # readers no longer block the writer and vice versa
+    synchronous: str = "NORMAL"  # safe with WAL: a power loss may only roll back the last commits, never corrupt the file
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size_kib: int = 64 * 1024
+    busy_timeout_ms: int = 5000
+    temp_store: str = "MEMORY"
+    pool_size: int = 8
+    max_overflow: int = 8
+
+    def get_pragmas(self) -> dict[str, str | int]:
+        return dict(
+            journal_mode=self.journal_mode,
+            synchronous=self.synchronous,
+            mmap_size=self.mmap_size,
+            cache_size=-self.cache_size_kib,  # negative values are interpreted by SQLite as KiB rather than pages
+            busy_timeout=self.busy_timeout_ms,
+            temp_store=self.temp_store
+        )
 
 
 class TooEarlyException(Exception):
@@ -23,9 +55,31 @@ class InitializingDatabaseSnapshotNotFoundError(Exception):
     pass
 
 
+class SnapshotIntegrityError(Exception):
+    pass
+
+
+class SnapshotAttachmentNotFoundError(Exception):
+    pass
+
+
+class InvalidDatabaseFileError(Exception):
+    pass
+
+
 @dataclass
 class EngineProvider:
-    engine: ClassVar[Engine | None] = None
+    engine: ClassVar[Engine | None] = None  # Sync fallback, used by Alembic, the in-memory cache loaders and the rarely called facades
+    async_engine: ClassVar[AsyncEngine | None] = None
+    db_path: ClassVar[Path] = Path(SQLITE_FILE_NAME)
+    swap_lock: ClassVar[asyncio.Lock] = asyncio.Lock()
+    snapshot_lock: ClassVar[asyncio.Lock] = asyncio.Lock()  # Held from taking a snapshot until it's committed, and while replacing the file, since both rely on the same reference files
+    profile: ClassVar[EngineProfile] = EngineProfile()
+    load_callbacks: ClassVar[list[Callable[[], None]]] = []  # Run each time a database file gets (re)loaded; used by the facades to (re)populate their in-memory caches
+
+    @classmethod
+    def add_load_callback(cls, callback: Callable[[], None]) -> None:
+        cls.load_callbacks.append(callback)
 
     @classmethod
     def get_session(cls) -> Session:
@@ -33,47 +87,188 @@ class EngineProvider:
             return Session(cls.engine)
         raise TooEarlyException
 
+    @classmethod
+    def get_async_session(cls) -> AsyncSession:
+        # Not expiring on commit: otherwise, reading an attribute of a committed entity would require an implicit (and, in async mode, impossible) refresh
+        if cls.async_engine:
+            return AsyncSession(cls.async_engine, expire_on_commit=False)
+        raise TooEarlyException
+
+    @classmethod
+    def _apply_profile(cls, engine: Engine) -> None:
+        pragmas = cls.profile.get_pragmas()
+
+        @event.listens_for(engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+            cursor.close()
+
+    @classmethod
+    def _create_engine(cls, db_path: Path) -> Engine:
+        engine = create_engine(f"sqlite:///{db_path}", pool_size=cls.profile.pool_size, max_overflow=cls.profile.max_overflow)
+        cls._apply_profile(engine)
+        return engine
+
+    @classmethod
+    def _create_async_engine(cls, db_path: Path) -> AsyncEngine:
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", pool_size=cls.profile.pool_size, max_overflow=cls.profile.max_overflow)
+        cls._apply_profile(async_engine.sync_engine)
+        return async_engine
+
+    @classmethod
+    async def take_snapshot(cls, force_full: bool = False) -> snapshots.Snapshot:
+        return await asyncio.to_thread(snapshots.take_snapshot, cls.db_path, force_full)
+
     @classmethod
     async def create(cls) -> None:
-        cls.engine = create_engine(SQLITE_URL)
-        SQLModel.metadata.create_all(cls.engine)
+        cls.db_path = Path(SQLITE_FILE_NAME)
+        cls.engine = cls._create_engine(cls.db_path)
+        cls.async_engine = cls._create_async_engine(cls.db_path)
+        cls._prepare_schema(cls.engine)
+        for callback in cls.load_callbacks:
+            callback()
         await CONFIG.bot.sync_tree()
 
+    @staticmethod
+    def _prepare_schema(engine: Engine) -> None:
+        SQLModel.metadata.create_all(engine)
+
+        # No ini file is passed on purpose: otherwise env.py would reconfigure (and thus mute) the bot's loggers
+        alembic_config = Config()
+        alembic_config.set_main_option("script_location", MIGRATIONS_DIR)
+        with engine.begin() as connection:
+            alembic_config.attributes["connection"] = connection
+            command.upgrade(alembic_config, "head")
+
+    @staticmethod
+    def _validate_file(db_path: Path) -> None:
+        try:
+            integrity_check_result = snapshots.check_integrity(db_path)
+        except sqlite3.DatabaseError as error:
+            raise InvalidDatabaseFileError(f"{db_path.name} is not a valid SQLite database: {error}") from error
+        if integrity_check_result != "ok":
+            raise InvalidDatabaseFileError(f"{db_path.name} failed the integrity check: {integrity_check_result}")
+
+    @staticmethod
+    async def _collect_manifest(channel: discord.TextChannel) -> list[snapshots.ManifestEntry]:
+        entries = []
+        async for message in channel.history(limit=None):
+            attachment = next((a for a in message.attachments if ".db" in a.filename or snapshots.is_changeset(a.filename)), None)
+            if attachment:
+                entry = snapshots.ManifestEntry.from_message_text(message.id, message.created_at, attachment.filename, attachment.size, message.content)
+                entries.append(entry)
+                if entry.is_full:
+                    entries.reverse()
+                    snapshots.write_manifest(entries)
+                    return entries
+        return []
+
+    @staticmethod
+    async def _download_snapshot(channel: discord.TextChannel, entry: snapshots.ManifestEntry) -> Path:
+        message = await channel.fetch_message(entry.message_id)
+        attachment = next((a for a in message.attachments if a.filename == entry.file_name), None)
+        if not attachment:
+            raise SnapshotAttachmentNotFoundError(f"Message {entry.message_id} no longer has {entry.file_name} attached")
+        target_path = snapshots.SNAPSHOT_DIR / entry.file_name
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+
+        digest = hashlib.sha256()
+        async with CONFIG.bot.client.get(attachment.url) as response:
+            response.raise_for_status()
+            with target_path.open("wb") as target_file:
+                async for chunk in response.content.iter_chunked(snapshots.COPY_CHUNK_SIZE):
+                    digest.update(chunk)
+                    target_file.write(chunk)
+
+        if entry.file_hash and digest.hexdigest() != entry.file_hash:
+            target_path.unlink()
+            raise SnapshotIntegrityError(f"Snapshot {entry.file_name} has been corrupted during download")
+        return target_path
+
     @classmethod
     async def load(cls) -> None:
         channel = CONFIG.bot.get_channel(get_stage_parameter_value(StageParameterID.SNAPSHOT_CHANNEL_ID))
         assert channel
-        async for message in channel.history():
-            for attachment in message.attachments:
-                if ".db" in attachment.filename:
-                    await attachment.save(SQLITE_FILE_NAME)
-                    await cls.create()
-                    if datetime.now(UTC) - message.created_at > timedelta(minutes=10):
-                        await channel.send(f"Warning: the snapshot loaded at startup was originally uploaded at {as_timestamp(message.created_at)}. If there were some updates after that, they have been lost")
-                    return
-        raise InitializingDatabaseSnapshotNotFoundError
+
+        manifest = snapshots.read_manifest() or await cls._collect_manifest(channel)
+        if not manifest:
+            raise InitializingDatabaseSnapshotNotFoundError
+
+        db_path = Path(SQLITE_FILE_NAME)
+        latest_checksum = manifest[-1].checksum
+        if latest_checksum and db_path.exists() and await asyncio.to_thread(snapshots.compute_file_checksum, db_path) == latest_checksum:
+            await cls.create()
+            return
+
+        try:
+            snapshot_paths = [await cls._download_snapshot(channel, entry) for entry in manifest]
+        except (discord.NotFound, SnapshotAttachmentNotFoundError):
+            # Some of the messages listed in the manifest have been deleted or lost their attachments, so the channel itself is the only source of truth left
+            manifest = await cls._collect_manifest(channel)
+            if not manifest:
+                raise InitializingDatabaseSnapshotNotFoundError
+            snapshot_paths = [await cls._download_snapshot(channel, entry) for entry in manifest]
+
+        # Leftovers of the previous run's WAL must not be replayed on top of a different database file
+        for sidecar_suffix in ("-wal", "-shm"):
+            Path(SQLITE_FILE_NAME + sidecar_suffix).unlink(missing_ok=True)
+        for swapped_file_path in db_path.parent.glob(SWAPPED_SQLITE_FILE_NAME_PATTERN):
+            swapped_file_path.unlink()
+        restore_result = await asyncio.to_thread(snapshots.restore, snapshot_paths[0], snapshot_paths[1:], db_path, manifest[0].uploaded_at)
+        await cls.create()
+
+        last_applied_entry = manifest[restore_result.applied_changesets]
+        if not restore_result.is_complete:
+            snapshots.write_manifest(manifest[:restore_result.applied_changesets + 1])
+            await channel.send(f"Warning: only {restore_result.applied_changesets} of {len(manifest) - 1} changesets following the snapshot uploaded at {as_timestamp(manifest[0].uploaded_at)} could be replayed, the rest don't match the restored state. The next backup will be a full one")
+        if datetime.now(UTC) - last_applied_entry.uploaded_at > timedelta(minutes=10):
+            await channel.send(f"Warning: the snapshot loaded at startup was originally uploaded at {as_timestamp(last_applied_entry.uploaded_at)}. If there were some updates after that, they have been lost")
 
     @classmethod
-    async def replace_file(cls, new_file_path: Path):
-        cls.engine.dispose()
-        cls.engine = None
+    async def replace_file(cls, new_file_path: Path) -> None:
+        async with cls.snapshot_lock, cls.swap_lock:
+            # Never renaming or overwriting the live file: the new one gets its own path, so the current engines keep serving until the very swap
+            db_path = Path(SQLITE_FILE_NAME).with_name(f"database.{datetime.now(UTC):%Y%m%d_%H%M%S_%f}.db")
+            new_file_path.replace(db_path)
+            engine = cls._create_engine(db_path)
+            async_engine = cls._create_async_engine(db_path)
+            try:
+                await asyncio.to_thread(cls._validate_file, db_path)
+                await asyncio.to_thread(cls._prepare_schema, engine)
+            except Exception:
+                await async_engine.dispose()
+                engine.dispose()
+                db_path.unlink(missing_ok=True)
+                raise
 
-        discarded_db_path = Path('data/old.db')
-        retries = 15
-        for i in range(retries):
+            old_engine, old_async_engine, old_db_path = cls.engine, cls.async_engine, cls.db_path
+            cls.engine, cls.async_engine, cls.db_path = engine, async_engine, db_path
+            snapshots.discard_reference()
+            for callback in cls.load_callbacks:
+                callback()
+
+        await cls._retire(old_engine, old_async_engine, old_db_path)
+        await CONFIG.bot.sync_tree()  # Picks up the text overrides brought by the new file, if any
+
+    @staticmethod
+    async def _retire(engine: Engine, async_engine: AsyncEngine, db_path: Path) -> None:
+        # Sessions opened before the swap are allowed to finish their work on the old file
+        deadline = datetime.now(UTC) + ENGINE_DRAIN_TIMEOUT
+        while engine.pool.checkedout() or async_engine.pool.checkedout():
+            if datetime.now(UTC) >= deadline:
+                # Unlinking now would silently send their remaining writes to an orphaned file, so the old one is left for the next startup to remove
+                CONFIG.bot.logger.warning(f"Connections to the replaced database {db_path} were still checked out after {ENGINE_DRAIN_TIMEOUT.total_seconds():.0f} s; keeping the file")
+                await async_engine.dispose()
+                engine.dispose()
+                return
+            await asyncio.sleep(0.1)
+        await async_engine.dispose()
+        engine.dispose()
+
+        for suffix in ("", "-wal", "-shm"):
             try:
-                Path(SQLITE_FILE_NAME).rename(discarded_db_path)
+                Path(f"{db_path}{suffix}").unlink(missing_ok=True)
             except PermissionError:
-                if i < retries - 1:
-                    await asyncio.sleep(1 + 0.5 * retries)
-                else:
-                    new_file_path.unlink()
-                    cls.engine = create_engine(SQLITE_URL)
-                    raise
-            else:
-                break
-
-        new_file_path.rename(SQLITE_FILE_NAME)
-        discarded_db_path.unlink()
-
-        await cls.create()
+                pass  # Still held open by a straggling connection (only possible on Windows); removed during the next startup
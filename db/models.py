@@ -1,9 +1,10 @@
 from datetime import datetime, UTC
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
-from util.datatypes import Opinion, CooldownEntity, Language
+from util.datatypes import Opinion, CooldownEntity, Language, RequestState
 from util.format import as_code, as_user
 from util.identifiers import LoggedEventTypeID, ParameterID, RouteID, TextPieceID, PermissionFlagID, UserPreferenceID
 
@@ -37,6 +38,12 @@ class PermissionFlag(SQLModel, table=True):
 
 
 class LoggedEvent(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_loggedevent_timestamp_id", "timestamp", "id"),
+        Index("ix_loggedevent_event_type_timestamp_id", "event_type", "timestamp", "id"),
+        Index("ix_loggedevent_user_id_timestamp_id", "user_id", "timestamp", "id"),
+    )
+
     id: int | None = Field(primary_key=True)
     timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
     event_type: LoggedEventTypeID
@@ -44,6 +51,19 @@ class LoggedEvent(SQLModel, table=True):
     custom_data: str = Field(default="{}")
 
 
+class LoggedEventField(SQLModel, table=True):
+    """
+    A normalized copy of LoggedEvent.custom_data, allowing the custom field filters to be resolved via an index instead of scanning the JSON
+    """
+    __table_args__ = (
+        Index("ix_loggedeventfield_key_value", "key", "value", "event_id"),
+    )
+
+    event_id: int = Field(foreign_key="loggedevent.id", primary_key=True)
+    key: str = Field(primary_key=True)
+    value: str
+
+
 class StoredLogFilter(SQLModel, table=True):
     name: str = Field(primary_key=True)
     user_id: int | None
@@ -55,6 +75,12 @@ class StoredLogFilter(SQLModel, table=True):
 
 
 class Cooldown(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_cooldown_ends_at", "ends_at"),
+        Index("ix_cooldown_entity_ends_at_entity_id", "entity", "ends_at", "entity_id"),
+        Index("ix_cooldown_entity_casted_at_entity_id", "entity", "casted_at", "entity_id"),
+    )
+
     entity: CooldownEntity = Field(primary_key=True)
     entity_id: int = Field(primary_key=True)
     casted_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -83,6 +109,15 @@ class Cooldown(SQLModel, table=True):
 
 
 class Request(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_request_state_requested_at", "state", "requested_at"),
+        Index("ix_request_level_id_state", "level_id", "state"),
+        Index("ix_request_level_id_requested_at", "level_id", "requested_at"),
+        Index("ix_request_resolution_message_id_requested_at", "resolution_message_id", "requested_at"),
+        Index("ix_request_requested_at", "requested_at"),
+        Index("ix_request_resolved_at", "resolved_at"),
+    )
+
     id: int | None = Field(primary_key=True)
 
     level_id: int
@@ -96,11 +131,15 @@ class Request(SQLModel, table=True):
 
     details_message_id: int | None  # reviewers' widget when unresolved, else archive entry
     details_message_channel_id: int | None
+    is_details_message_deleted: bool = False
     resolution_message_id: int | None
     resolution_message_channel_id: int | None
 
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))  # on command executed successfully
     requested_at: datetime | None  # on modal submitted successfully
+    resolved_at: datetime | None = None  # on first resolution
+
+    state: RequestState = RequestState.LIMBO  # stays APPROVED once any resolution approves the request
 
     opinions: list["RequestOpinion"] = Relationship(back_populates="request", cascade_delete=True)
     reviews: list["RequestReview"] = Relationship(back_populates="request", passive_deletes=True)
@@ -111,6 +150,12 @@ class Request(SQLModel, table=True):
 
 
 class RequestOpinion(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_requestopinion_request_id_author_user_id_created_at", "request_id", "author_user_id", "created_at"),
+        Index("ix_requestopinion_author_user_id_created_at", "author_user_id", "created_at"),
+        Index("ix_requestopinion_author_user_id_opinion_request_id_created_at", "author_user_id", "opinion", "request_id", "created_at"),
+    )
+
     id: int | None = Field(primary_key=True)
 
     author_user_id: int
@@ -126,6 +171,12 @@ class RequestOpinion(SQLModel, table=True):
 
 
 class RequestReview(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_requestreview_request_id_author_user_id_created_at", "request_id", "author_user_id", "created_at"),
+        Index("ix_requestreview_author_user_id_created_at_id", "author_user_id", "created_at", "id"),
+        Index("ix_requestreview_created_at", "created_at"),
+    )
+
     id: int | None = Field(primary_key=True)
 
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -135,12 +186,17 @@ class RequestReview(SQLModel, table=True):
     message_channel_id: int
     opinion: Opinion
     is_trainee: bool = False
+    is_message_deleted: bool = False
 
     request_id: int | None = Field(foreign_key="request.id", ondelete="SET NULL")
     request: Optional[Request] = Relationship(back_populates="reviews", passive_deletes=True)
 
 
 class TraineeReviewOpinion(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_traineereviewopinion_review_id", "review_id"),
+    )
+
     id: int | None = Field(primary_key=True)
 
     opinion_author_user_id: int
@@ -0,0 +1,317 @@
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+SNAPSHOT_DIR = Path("data/snapshots")
+REFERENCE_DB_PATH = SNAPSHOT_DIR / "reference.db"  # Raw copy of the state captured by the latest uploaded snapshot; changesets are computed against it
+REFERENCE_INFO_PATH = SNAPSHOT_DIR / "reference.json"
+PENDING_DB_PATH = SNAPSHOT_DIR / "pending.db"
+MANIFEST_PATH = Path("data/snapshots.json")  # Snapshot chain currently stored remotely: the latest full snapshot followed by its changesets
+FULL_SNAPSHOT_SUFFIX = ".db.gz"
+CHANGESET_SUFFIX = ".changeset.json.gz"
+FULL_SNAPSHOT_INTERVAL = timedelta(days=7)
+APPEND_ONLY_TABLES = {"loggedevent": "id", "loggedeventfield": "event_id"}  # Table name -> column compared against the loggedevent high-water mark
+UNTRACKED_TABLES = {"alembic_version"}
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    path: Path
+    size: int
+    raw_size: int
+    duration: timedelta
+    is_full: bool
+    checksum: str
+    file_hash: str
+
+    def describe_checksums(self) -> str:
+        return f"sha256: {self.file_hash}\nstate: {self.checksum}"
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    message_id: int
+    uploaded_at: datetime
+    file_name: str
+    size: int
+    is_full: bool
+    checksum: str | None  # Not known for the snapshots uploaded before the checksums were added to the message text
+    file_hash: str | None
+
+    @classmethod
+    def from_message_text(cls, message_id: int, uploaded_at: datetime, file_name: str, size: int, text: str) -> "ManifestEntry":
+        checksum_match = re.search(r"^state: ([0-9a-f]{64})$", text, re.MULTILINE)
+        file_hash_match = re.search(r"^sha256: ([0-9a-f]{64})$", text, re.MULTILINE)
+        return cls(
+            message_id=message_id,
+            uploaded_at=uploaded_at,
+            file_name=file_name,
+            size=size,
+            is_full=not is_changeset(file_name),
+            checksum=checksum_match.group(1) if checksum_match else None,
+            file_hash=file_hash_match.group(1) if file_hash_match else None
+        )
+
+    @classmethod
+    def from_dict(cls, content: dict) -> "ManifestEntry":
+        return cls(**content | dict(uploaded_at=datetime.fromisoformat(content["uploaded_at"])))
+
+    def to_dict(self) -> dict:
+        return dict(
+            message_id=self.message_id,
+            uploaded_at=self.uploaded_at.isoformat(),
+            file_name=self.file_name,
+            size=self.size,
+            is_full=self.is_full,
+            checksum=self.checksum,
+            file_hash=self.file_hash
+        )
+
+
+@dataclass(frozen=True)
+class ReferenceInfo:
+    checksum: str
+    base_taken_at: datetime
+
+    @classmethod
+    def read(cls) -> "ReferenceInfo | None":
+        if not REFERENCE_DB_PATH.exists() or not REFERENCE_INFO_PATH.exists():
+            return None
+        content = json.loads(REFERENCE_INFO_PATH.read_text(encoding="utf-8"))
+        return cls(checksum=content["checksum"], base_taken_at=datetime.fromisoformat(content["base_taken_at"]))
+
+    def write(self) -> None:
+        REFERENCE_INFO_PATH.write_text(json.dumps(dict(checksum=self.checksum, base_taken_at=self.base_taken_at.isoformat())), encoding="utf-8")
+
+
+@dataclass(frozen=True)
+class RestoreResult:
+    applied_changesets: int
+    checksum: str
+    is_complete: bool
+
+
+def is_changeset(file_name: str) -> bool:
+    return file_name.endswith(CHANGESET_SUFFIX)
+
+
+def read_manifest() -> list[ManifestEntry]:
+    if not MANIFEST_PATH.exists():
+        return []
+    return [ManifestEntry.from_dict(entry) for entry in json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))]
+
+
+def write_manifest(entries: list[ManifestEntry]) -> None:
+    MANIFEST_PATH.write_text(json.dumps([entry.to_dict() for entry in entries], indent=2), encoding="utf-8")
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_integrity(db_path: Path) -> str:
+    with closing(sqlite3.connect(db_path)) as connection:
+        return connection.execute("PRAGMA integrity_check").fetchone()[0]
+
+
+def copy_database(source_path: Path, target_path: Path) -> None:
+    # The online backup API copies a consistent state of the database even while the bot keeps writing to it
+    with closing(sqlite3.connect(source_path)) as source, closing(sqlite3.connect(target_path)) as target:
+        source.backup(target)
+
+
+def compress(source_path: Path, target_path: Path) -> None:
+    with source_path.open("rb") as source_file, gzip.open(target_path, "wb", compresslevel=6) as target_file:
+        shutil.copyfileobj(source_file, target_file, COPY_CHUNK_SIZE)
+
+
+def unpack(snapshot_path: Path, target_path: Path) -> None:
+    if snapshot_path.name.endswith(".gz"):
+        with gzip.open(snapshot_path, "rb") as compressed_file, target_path.open("wb") as target_file:
+            shutil.copyfileobj(compressed_file, target_file, COPY_CHUNK_SIZE)
+        snapshot_path.unlink()
+    else:
+        snapshot_path.replace(target_path)
+
+
+def _get_tables(connection: sqlite3.Connection, schema: str = "main") -> dict[str, str]:
+    rows = connection.execute(f"SELECT name, sql FROM {schema}.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'").fetchall()
+    return {name: sql for name, sql in rows if name not in UNTRACKED_TABLES}
+
+
+def _get_columns(connection: sqlite3.Connection, table: str) -> list[str]:
+    return [row[1] for row in connection.execute(f'PRAGMA main.table_info("{table}")')]
+
+
+def _get_key_columns(connection: sqlite3.Connection, table: str) -> list[str]:
+    key_columns = sorted((row[5], row[1]) for row in connection.execute(f'PRAGMA main.table_info("{table}")') if row[5])
+    return [name for _, name in key_columns] or ["rowid"]
+
+
+def _as_column_list(columns: list[str]) -> str:
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def compute_file_checksum(db_path: Path) -> str:
+    with closing(sqlite3.connect(db_path)) as connection:
+        return compute_checksum(connection)
+
+
+def compute_checksum(connection: sqlite3.Connection) -> str:
+    # Covers the logical content rather than the file bytes, which differ between a copied and a replayed database
+    digest = hashlib.sha256()
+    for table in sorted(_get_tables(connection)):
+        columns = _get_columns(connection, table)
+        digest.update(repr((table, columns)).encode())
+        for row in connection.execute(f'SELECT {_as_column_list(columns)} FROM "{table}" ORDER BY {_as_column_list(_get_key_columns(connection, table))}'):
+            digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+
+def _build_changeset(connection: sqlite3.Connection, reference: ReferenceInfo, checksum: str) -> dict | None:
+    connection.execute("ATTACH DATABASE ? AS ref", (str(REFERENCE_DB_PATH),))
+    try:
+        if _get_tables(connection) != _get_tables(connection, "ref"):
+            return None
+
+        event_high_water_mark = connection.execute("SELECT coalesce(max(id), 0) FROM ref.loggedevent").fetchone()[0]
+        tables = {}
+        for table in _get_tables(connection):
+            columns = _get_columns(connection, table)
+            key_columns = _get_key_columns(connection, table)
+
+            if table in APPEND_ONLY_TABLES:
+                mark_column = APPEND_ONLY_TABLES[table]
+                old_rows_count = connection.execute(f'SELECT count(*) FROM main."{table}" WHERE "{mark_column}" <= ?', (event_high_water_mark,)).fetchone()[0]
+                if old_rows_count != connection.execute(f'SELECT count(*) FROM ref."{table}"').fetchone()[0]:
+                    return None
+                upserts = connection.execute(f'SELECT {_as_column_list(columns)} FROM main."{table}" WHERE "{mark_column}" > ?', (event_high_water_mark,)).fetchall()
+                deletes = []
+            else:
+                upserts = connection.execute(f'SELECT {_as_column_list(columns)} FROM main."{table}" EXCEPT SELECT {_as_column_list(columns)} FROM ref."{table}"').fetchall()
+                deletes = connection.execute(f'SELECT {_as_column_list(key_columns)} FROM ref."{table}" EXCEPT SELECT {_as_column_list(key_columns)} FROM main."{table}"').fetchall()
+
+            if upserts or deletes:
+                tables[table] = dict(columns=columns, key_columns=key_columns, upserts=upserts, deletes=deletes)
+    finally:
+        connection.execute("DETACH DATABASE ref")
+
+    return dict(parent_checksum=reference.checksum, checksum=checksum, tables=tables)
+
+
+def apply_changeset(connection: sqlite3.Connection, changeset: dict) -> None:
+    for table, changes in changeset["tables"].items():
+        key_condition = " AND ".join(f'"{column}" = ?' for column in changes["key_columns"])
+        connection.executemany(f'DELETE FROM "{table}" WHERE {key_condition}', changes["deletes"])
+        placeholders = ", ".join("?" for _ in changes["columns"])
+        connection.executemany(f'INSERT OR REPLACE INTO "{table}" ({_as_column_list(changes["columns"])}) VALUES ({placeholders})', changes["upserts"])
+
+
+def take_snapshot(db_path: Path, force_full: bool) -> Snapshot:
+    started_at = time.perf_counter()
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    file_stem = f"database_{datetime.now(UTC):%Y%m%d_%H%M%S_%f}"
+
+    PENDING_DB_PATH.unlink(missing_ok=True)
+    copy_database(db_path, PENDING_DB_PATH)
+
+    reference = ReferenceInfo.read()
+    with closing(sqlite3.connect(PENDING_DB_PATH)) as connection:
+        checksum = compute_checksum(connection)
+        changeset = None
+        if not force_full and reference and datetime.now(UTC) - reference.base_taken_at < FULL_SNAPSHOT_INTERVAL:
+            changeset = _build_changeset(connection, reference, checksum)
+
+    if changeset is None:
+        snapshot_path = SNAPSHOT_DIR / f"{file_stem}{FULL_SNAPSHOT_SUFFIX}"
+        compress(PENDING_DB_PATH, snapshot_path)
+        raw_size = PENDING_DB_PATH.stat().st_size
+    else:
+        snapshot_path = SNAPSHOT_DIR / f"{file_stem}{CHANGESET_SUFFIX}"
+        raw_changeset = json.dumps(changeset, separators=(",", ":")).encode()
+        with gzip.open(snapshot_path, "wb", compresslevel=6) as snapshot_file:
+            snapshot_file.write(raw_changeset)
+        raw_size = len(raw_changeset)
+
+    return Snapshot(
+        path=snapshot_path,
+        size=snapshot_path.stat().st_size,
+        raw_size=raw_size,
+        duration=timedelta(seconds=time.perf_counter() - started_at),
+        is_full=changeset is None,
+        checksum=checksum,
+        file_hash=hash_file(snapshot_path)
+    )
+
+
+def commit_snapshot(snapshot: Snapshot, message_id: int, uploaded_at: datetime) -> None:
+    # Called once the snapshot has been uploaded, so that the next changeset builds upon the state stored remotely
+    base_taken_at = datetime.now(UTC) if snapshot.is_full else ReferenceInfo.read().base_taken_at
+    PENDING_DB_PATH.replace(REFERENCE_DB_PATH)
+    ReferenceInfo(checksum=snapshot.checksum, base_taken_at=base_taken_at).write()
+
+    entry = ManifestEntry(
+        message_id=message_id,
+        uploaded_at=uploaded_at,
+        file_name=snapshot.path.name,
+        size=snapshot.size,
+        is_full=snapshot.is_full,
+        checksum=snapshot.checksum,
+        file_hash=snapshot.file_hash
+    )
+    write_manifest([entry] if snapshot.is_full else read_manifest() + [entry])
+
+
+def discard_pending() -> None:
+    # Called when the snapshot never made it to the channel, so that the reference stays at the last uploaded state
+    PENDING_DB_PATH.unlink(missing_ok=True)
+
+
+def discard_reference() -> None:
+    REFERENCE_INFO_PATH.unlink(missing_ok=True)
+    REFERENCE_DB_PATH.unlink(missing_ok=True)
+
+
+def restore(base_path: Path, changeset_paths: list[Path], target_path: Path, base_taken_at: datetime) -> RestoreResult:
+    unpack(base_path, target_path)
+
+    applied_changesets = 0
+    with closing(sqlite3.connect(target_path)) as connection:
+        checksum = compute_checksum(connection)
+        for changeset_path in changeset_paths:
+            with gzip.open(changeset_path, "rb") as changeset_file:
+                changeset = json.loads(changeset_file.read())
+            if changeset["parent_checksum"] != checksum:
+                break
+            apply_changeset(connection, changeset)
+            if compute_checksum(connection) != changeset["checksum"]:
+                connection.rollback()
+                break
+            connection.commit()
+            checksum = changeset["checksum"]
+            applied_changesets += 1
+
+    for changeset_path in changeset_paths:
+        changeset_path.unlink()
+
+    is_complete = applied_changesets == len(changeset_paths)
+    if is_complete:
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        copy_database(target_path, REFERENCE_DB_PATH)
+        ReferenceInfo(checksum=checksum, base_taken_at=base_taken_at).write()
+    else:
+        discard_reference()
+    return RestoreResult(applied_changesets=applied_changesets, checksum=checksum, is_complete=is_complete)
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, UTC
 
 from discord import Member
 from sqlalchemy import Select
+from sqlalchemy.orm import selectinload
 
 from db.models import Cooldown, Request
 from db import EngineProvider
@@ -12,7 +13,7 @@ from sqlmodel import col, select
 import facades
 from facades.eventlog import add_entry
 from globalconf import CONFIG
-from util.datatypes import CooldownEntity
+from util.datatypes import CooldownEntity, Seek
 from util.exceptions import AlreadySatisfiesError
 from util.identifiers import LoggedEventTypeID, ParameterID
 from util.parsers import is_infinite_duration, is_null_duration, parse_abs_duration
@@ -45,7 +46,8 @@ class CooldownEndIsInPast(Exception):
 @dataclass
 class CooldownInfo:
     entity_id: int
-    ends_at: datetime
+    casted_at: datetime
+    ends_at: datetime | None
     reason: str | None
 
 
@@ -124,31 +126,31 @@ def exceeds_current(current_ends_at: datetime | None, new_ends_at: datetime | No
     return current_ends_at and (not new_ends_at or new_ends_at > current_ends_at)
 
 
-def clean_table() -> None:
+async def clean_table() -> None:
     select_query = select(
         Cooldown
     ).where(
         col(Cooldown.ends_at).is_not(None),
         Cooldown.ends_at <= datetime.now(UTC)
     )
-    with EngineProvider.get_session() as session:
-        for entry in session.exec(select_query):  # noqa
-            session.delete(entry)
-        session.commit()
+    async with EngineProvider.get_async_session() as session:
+        for entry in await session.exec(select_query):  # noqa
+            await session.delete(entry)
+        await session.commit()
 
 
-def get_current_cooldown(entity_type: CooldownEntity, entity_id: int) -> Cooldown | None:
-    clean_table()
+async def get_current_cooldown(entity_type: CooldownEntity, entity_id: int) -> Cooldown | None:
+    await clean_table()
 
-    with EngineProvider.get_session() as session:
-        return session.get(Cooldown, (entity_type, entity_id))
+    async with EngineProvider.get_async_session() as session:
+        return await session.get(Cooldown, (entity_type, entity_id))
 
 
-def get_current_cooldown_eagerly(entity_type: CooldownEntity, entity_id: int) -> EagerlyPreloadedCooldown | None:
-    clean_table()
+async def get_current_cooldown_eagerly(entity_type: CooldownEntity, entity_id: int) -> EagerlyPreloadedCooldown | None:
+    await clean_table()
 
-    with EngineProvider.get_session() as session:
-        cooldown = session.get(Cooldown, (entity_type, entity_id))
+    async with EngineProvider.get_async_session() as session:
+        cooldown = await session.get(Cooldown, (entity_type, entity_id), options=[selectinload(Cooldown.causing_request)])  # noqa
         if cooldown:
             return EagerlyPreloadedCooldown(cooldown, cooldown.causing_request)  # noqa
         return None
@@ -160,7 +162,7 @@ async def cast_after_request(entity_type: CooldownEntity, entity_id: int, reques
     if is_null_duration(raw_cooldown_duration):
         return
 
-    current = get_current_cooldown(entity_type, entity_id)
+    current = await get_current_cooldown(entity_type, entity_id)
 
     now_datetime = datetime.now(UTC)
     new_ends_at = None if is_infinite_duration(raw_cooldown_duration) else now_datetime + parse_abs_duration(raw_cooldown_duration)
@@ -182,9 +184,9 @@ async def cast_after_request(entity_type: CooldownEntity, entity_id: int, reques
         causing_request_id=request_id
     )
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         session.add(current)
-        session.commit()
+        await session.commit()
 
     await __log_cooldown_update(None, entity_type, entity_id, old_ends_at, new_ends_at, reason)
 
@@ -196,7 +198,7 @@ async def manually_set(entity_type: CooldownEntity, entity_id: int, caster: Memb
     if duration and duration.total_seconds() <= 0:
         raise CooldownEndIsInPast(ends_at=new_ends_at)
 
-    current = get_current_cooldown(entity_type, entity_id)
+    current = await get_current_cooldown(entity_type, entity_id)
     old_ends_at = current.exact_ends_at if current else NO_COOLDOWN
 
     if current and not force:
@@ -212,15 +214,15 @@ async def manually_set(entity_type: CooldownEntity, entity_id: int, caster: Memb
         caster_user_id=caster.id
     )
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         session.add(current)
-        session.commit()
+        await session.commit()
 
     await __log_cooldown_update(caster, entity_type, entity_id, old_ends_at, new_ends_at, reason)
 
 
 async def manually_modify(entity_type: CooldownEntity, entity_id: int, caster: Member, delta_with_current: timedelta, reason: str | None = None) -> None:
-    current = get_current_cooldown(entity_type, entity_id)
+    current = await get_current_cooldown(entity_type, entity_id)
 
     if current and not current.exact_ends_at:
         raise CooldownEndlessError
@@ -243,73 +245,68 @@ async def manually_modify(entity_type: CooldownEntity, entity_id: int, caster: M
         caster_user_id=caster.id
     )
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         session.add(current)
-        session.commit()
+        await session.commit()
 
     await __log_cooldown_update(caster, entity_type, entity_id, old_ends_at, new_ends_at, reason)
 
 
 async def manually_amend(entity_type: CooldownEntity, entity_id: int,  amending_user: Member, reason: str | None = None) -> None:
-    current = get_current_cooldown(entity_type, entity_id)
+    current = await get_current_cooldown(entity_type, entity_id)
 
     if not current:
         raise AlreadySatisfiesError
 
     old_ends_at = current.exact_ends_at
 
-    with EngineProvider.get_session() as session:
-        session.delete(current)
-        session.commit()
+    async with EngineProvider.get_async_session() as session:
+        await session.delete(current)
+        await session.commit()
 
     await __log_cooldown_update(amending_user, entity_type, entity_id, old_ends_at, NO_COOLDOWN, reason)
 
 
-def list_temporary_cooldowns(entity: CooldownEntity, limit: int, offset: int = 0) -> list[CooldownInfo]:
-    if offset == 0:
-        clean_table()
+async def list_temporary_cooldowns(entity: CooldownEntity, limit: int, seek: Seek = Seek()) -> list[CooldownInfo]:
+    if not seek.cursor:
+        await clean_table()
 
     query: Select[Cooldown] = select(  # noqa
         Cooldown
     ).where(
         Cooldown.entity == entity,
         col(Cooldown.ends_at).is_not(None)
-    ).order_by(
-        col(Cooldown.ends_at).desc(),
-        col(Cooldown.casted_at)
-    ).limit(
-        limit
-    ).offset(
-        offset
     )
+    query = seek.restrict_query(query, col(Cooldown.ends_at), col(Cooldown.entity_id), limit, descending=True)
 
-    with EngineProvider.get_session() as session:
-        return [
+    async with EngineProvider.get_async_session() as session:
+        return seek.to_page_order([
             CooldownInfo(
                 entity_id=entry.entity_id,
+                casted_at=entry.exact_casted_at,
                 ends_at=entry.exact_ends_at,
                 reason=entry.reason
             )
-            for entry in session.exec(query)
-        ]
+            for entry in await session.exec(query)
+        ])
 
 
-def list_endless_cooldowns(entity: CooldownEntity, limit: int, offset: int = 0) -> dict[int, str | None]:
+async def list_endless_cooldowns(entity: CooldownEntity, limit: int, seek: Seek = Seek()) -> list[CooldownInfo]:
     query: Select[Cooldown] = select(  # noqa
         Cooldown
     ).where(
         Cooldown.entity == entity,
         col(Cooldown.ends_at).is_(None)
-    ).order_by(
-        Cooldown.casted_at
-    ).limit(
-        limit
-    ).offset(
-        offset
     )
+    query = seek.restrict_query(query, col(Cooldown.casted_at), col(Cooldown.entity_id), limit)
 
-    with EngineProvider.get_session() as session:
-        return {
-            entry.entity_id: entry.reason
-            for entry in session.exec(query)
-        }
+    async with EngineProvider.get_async_session() as session:
+        return seek.to_page_order([
+            CooldownInfo(
+                entity_id=entry.entity_id,
+                casted_at=entry.exact_casted_at,
+                ends_at=None,
+                reason=entry.reason
+            )
+            for entry in await session.exec(query)
+        ])
@@ -1,20 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import traceback
 from dataclasses import dataclass, field
-from datetime import datetime, UTC
 
 import yaml
 import typing as tp
 
 import discord
+from sqlalchemy import ColumnElement
 from sqlmodel.sql._expression_select_cls import Select, SelectOfScalar
 
-from db.models import LoggedEvent, StoredLogFilter
+from db.models import LoggedEvent, LoggedEventField, StoredLogFilter
+from util.datatypes import Seek
 from util.exceptions import AlreadySatisfiesError
 from util.format import as_code_block, logs_member_ref
 from util.identifiers import LoggedEventTypeID, RouteID
-from sqlmodel import select, col, func
+from sqlmodel import select, col
 
 from db import EngineProvider
 
@@ -48,6 +51,84 @@ class LoadedLogFilter:
         )
 
 
+@dataclass
+class PendingLogEntry:
+    event: LoggedEvent
+    custom_data: dict[str, str]
+    event_dict: dict[str, str]
+
+
+class EventLogWriter:
+    """
+    Takes the event log off the critical path: entries are queued and persisted by a background consumer, one transaction and one coalesced LOG message per flush
+    """
+    def __init__(self, max_queue_size: int = 1000, flush_interval: float = 2, max_batch_size: int = 200) -> None:
+        self.max_queue_size = max_queue_size
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.queue: asyncio.Queue[PendingLogEntry] | None = None
+        self.consumer: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.consumer = asyncio.create_task(self._consume())
+
+    async def close(self) -> None:
+        if not self.consumer:
+            return
+        await self.queue.join()
+        self.consumer.cancel()
+        self.consumer = None
+
+    async def enqueue(self, entry: PendingLogEntry) -> None:
+        if self.consumer:
+            await self.queue.put(entry)  # Blocks when the queue is full, applying backpressure to the producers
+        else:
+            await self._flush([entry])
+
+    async def _consume(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            if self.queue.empty():
+                await asyncio.sleep(self.flush_interval)
+            while not self.queue.empty() and len(batch) < self.max_batch_size:
+                batch.append(self.queue.get_nowait())
+
+            try:
+                await self._flush(batch)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    @staticmethod
+    async def _flush(batch: list[PendingLogEntry]) -> None:
+        async with EngineProvider.get_async_session() as session:
+            session.add_all([entry.event for entry in batch])
+            await session.flush()
+            session.add_all([
+                LoggedEventField(event_id=entry.event.id, key=key, value=str(value))
+                for entry in batch
+                for key, value in entry.custom_data.items()
+            ])
+            await session.commit()
+
+        import services.disc
+        posted_message = ""
+        for entry in batch:
+            block = as_code_block(yaml.safe_dump(entry.event_dict, sort_keys=False, allow_unicode=True), "yaml")
+            if posted_message and len(posted_message) + len(block) + 1 > services.disc.MESSAGE_LENGTH_LIMIT:
+                services.disc.submit_raw_text(RouteID.LOG, posted_message)
+                posted_message = block
+            else:
+                posted_message = f"{posted_message}\n{block}" if posted_message else block
+        services.disc.submit_raw_text(RouteID.LOG, posted_message)
+
+
+EVENT_LOG_WRITER = EventLogWriter()
+
+
 async def add_entry(event_type: LoggedEventTypeID, user: discord.Member | None = None, custom_data: dict[str, str] | None = None) -> None:
     user_str = logs_member_ref(user)
 
@@ -57,40 +138,36 @@ async def add_entry(event_type: LoggedEventTypeID, user: discord.Member | None =
         printed_message += f' ({pairs})'
     print(printed_message)
 
+    custom_data_str = json.dumps(custom_data, ensure_ascii=False) if custom_data else "{}"
+    new_entry = LoggedEvent(event_type=event_type, user_id=user.id if user else None, custom_data=custom_data_str)
+
     event_dict = dict(
         event=event_type.name,
         user=user_str,
-        timestamp=datetime.now(UTC).isoformat()
+        timestamp=new_entry.timestamp.isoformat()
     )
-    event_dict.update(custom_data)
-    posted_message = as_code_block(yaml.safe_dump(event_dict, sort_keys=False, allow_unicode=True), "yaml")
-    import services.disc
-    await services.disc.post_raw_text(RouteID.LOG, posted_message)
+    event_dict.update(custom_data or {})
 
-    custom_data_str = json.dumps(custom_data, ensure_ascii=False) if custom_data else "{}"
-    with EngineProvider.get_session() as session:
-        new_entry = LoggedEvent(event_type=event_type, user_id=user.id if user else None, custom_data=custom_data_str)
-        session.add(new_entry)
-        session.commit()
+    await EVENT_LOG_WRITER.enqueue(PendingLogEntry(new_entry, custom_data or {}, event_dict))
 
 
 def _current_filter_name(user: discord.Member) -> str:
     return f'@{user.id}'
 
 
-def get_filter(name: str) -> StoredLogFilter | None:
-    with EngineProvider.get_session() as session:
-        return session.get(StoredLogFilter, name)  # noqa
+async def get_filter(name: str) -> StoredLogFilter | None:
+    async with EngineProvider.get_async_session() as session:
+        return await session.get(StoredLogFilter, name)  # noqa
 
 
-def get_current_filter(user: discord.Member) -> StoredLogFilter:
+async def get_current_filter(user: discord.Member) -> StoredLogFilter:
     filter_name = _current_filter_name(user)
-    return get_filter(filter_name) or StoredLogFilter(name=filter_name)
+    return await get_filter(filter_name) or StoredLogFilter(name=filter_name)
 
 
-def save_filter(name: str, log_filter: StoredLogFilter, force: bool = False) -> None:
-    with EngineProvider.get_session() as session:
-        stored_filter = session.get(StoredLogFilter, name)
+async def save_filter(name: str, log_filter: StoredLogFilter, force: bool = False) -> None:
+    async with EngineProvider.get_async_session() as session:
+        stored_filter = await session.get(StoredLogFilter, name)
 
         if not stored_filter:
             stored_filter = StoredLogFilter(name=name)
@@ -102,18 +179,18 @@ def save_filter(name: str, log_filter: StoredLogFilter, force: bool = False) ->
         stored_filter.custom_data_values = log_filter.custom_data_values
 
         session.add(stored_filter)
-        session.commit()
+        await session.commit()
 
 
-def select_filter(user: discord.Member, name: str) -> None:
-    log_filter = get_filter(name)
+async def select_filter(user: discord.Member, name: str) -> None:
+    log_filter = await get_filter(name)
     if not log_filter:
         raise NotExistsError
-    save_filter(_current_filter_name(user), log_filter, force=True)
+    await save_filter(_current_filter_name(user), log_filter, force=True)
 
 
-def update_filter_user(current_filter_owner: discord.Member, restricted_user: discord.Member | None) -> None:
-    stored_filter = get_current_filter(current_filter_owner)
+async def update_filter_user(current_filter_owner: discord.Member, restricted_user: discord.Member | None) -> None:
+    stored_filter = await get_current_filter(current_filter_owner)
 
     passed_user_id = restricted_user.id if restricted_user else None
 
@@ -122,26 +199,26 @@ def update_filter_user(current_filter_owner: discord.Member, restricted_user: di
 
     stored_filter.user_id = passed_user_id
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         session.add(stored_filter)
-        session.commit()
+        await session.commit()
 
 
-def update_filter_event_type(current_filter_owner: discord.Member, restricted_event_type: LoggedEventTypeID | None) -> None:
-    stored_filter = get_current_filter(current_filter_owner)
+async def update_filter_event_type(current_filter_owner: discord.Member, restricted_event_type: LoggedEventTypeID | None) -> None:
+    stored_filter = await get_current_filter(current_filter_owner)
 
     if stored_filter.event_type == restricted_event_type:
         raise AlreadySatisfiesError
 
     stored_filter.event_type = restricted_event_type
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         session.add(stored_filter)
-        session.commit()
+        await session.commit()
 
 
-def update_filter_custom_field(current_filter_owner: discord.Member, key: str, value: str | None) -> None:
-    stored_filter = get_current_filter(current_filter_owner)
+async def update_filter_custom_field(current_filter_owner: discord.Member, key: str, value: str | None) -> None:
+    stored_filter = await get_current_filter(current_filter_owner)
 
     custom_data_dict: dict[str, str] = json.loads(stored_filter.custom_data_values)
 
@@ -154,41 +231,47 @@ def update_filter_custom_field(current_filter_owner: discord.Member, key: str, v
         custom_data_dict.pop(key, None)
     stored_filter.custom_data_values = json.dumps(custom_data_dict, ensure_ascii=False)
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         session.add(stored_filter)
-        session.commit()
+        await session.commit()
 
 
-def clear_filter_custom_fields(current_filter_owner: discord.Member) -> None:
-    stored_filter = get_current_filter(current_filter_owner)
+async def clear_filter_custom_fields(current_filter_owner: discord.Member) -> None:
+    stored_filter = await get_current_filter(current_filter_owner)
 
     if stored_filter.custom_data_values == "{}":
         raise AlreadySatisfiesError
 
     stored_filter.custom_data_values = "{}"
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         session.add(stored_filter)
-        session.commit()
+        await session.commit()
 
 
-def delete_filter(filter_name: str) -> None:
-    with EngineProvider.get_session() as session:
-        stored_filter = session.get(StoredLogFilter, filter_name)
+async def delete_filter(filter_name: str) -> None:
+    async with EngineProvider.get_async_session() as session:
+        stored_filter = await session.get(StoredLogFilter, filter_name)
         if not stored_filter:
             raise AlreadySatisfiesError
-        session.delete(stored_filter)
-        session.commit()
+        await session.delete(stored_filter)
+        await session.commit()
 
 
-def clear_current_filter(current_filter_owner: discord.Member) -> None:
-    delete_filter(_current_filter_name(current_filter_owner))
+async def clear_current_filter(current_filter_owner: discord.Member) -> None:
+    await delete_filter(_current_filter_name(current_filter_owner))
 
 
-def list_filters() -> set[str]:
-    with EngineProvider.get_session() as session:
+async def list_filters() -> set[str]:
+    async with EngineProvider.get_async_session() as session:
         query = select(StoredLogFilter.name).where(col(StoredLogFilter.name).startswith("@") == False)
-        return set(session.exec(query).all())  # noqa
+        return set((await session.exec(query)).all())  # noqa
+
+
+def custom_field_equals(key: str, value: tp.Any) -> ColumnElement[bool]:
+    return col(LoggedEvent.id).in_(
+        select(LoggedEventField.event_id).where(LoggedEventField.key == key, LoggedEventField.value == str(value))
+    )
 
 
 def _apply_filter(log_filter: StoredLogFilter | LoadedLogFilter | None, query: Select | SelectOfScalar) -> Select | SelectOfScalar:
@@ -207,32 +290,24 @@ def _apply_filter(log_filter: StoredLogFilter | LoadedLogFilter | None, query: S
     if loaded.event_type:
         query = query.where(LoggedEvent.event_type == loaded.event_type)
     for key, value in loaded.custom_data_values.items():
-        query = query.where(col(LoggedEvent.custom_data).contains(f'"{key}": "{value}"'))
+        query = query.where(custom_field_equals(key, value))
     return query
 
 
-def get_entries(limit: int, offset: int = 0, log_filter: StoredLogFilter | LoadedLogFilter | None = None) -> list[LoggedEvent]:
+async def get_entries(limit: int, seek: Seek = Seek(), log_filter: StoredLogFilter | LoadedLogFilter | None = None) -> list[LoggedEvent]:
     query = select(LoggedEvent)
     query = _apply_filter(log_filter, query)
-    query = query.limit(limit).offset(offset)
-    with EngineProvider.get_session() as session:
-        return list(session.exec(query).all())
-
-
-def get_offset_at_datetime(ts: datetime, log_filter: StoredLogFilter | LoadedLogFilter | None = None) -> int:
-    query = select(func.count(LoggedEvent.id))
-    query = _apply_filter(log_filter, query)
-    query = query.where(LoggedEvent.timestamp < ts)
-    with EngineProvider.get_session() as session:
-        return session.exec(query).one()  # noqa
+    query = seek.restrict_query(query, col(LoggedEvent.timestamp), col(LoggedEvent.id), limit)
+    async with EngineProvider.get_async_session() as session:
+        return seek.to_page_order(list((await session.exec(query)).all()))
 
 
-def find_filters_by_prefix(pref: str) -> list[str]:
+async def find_filters_by_prefix(pref: str) -> list[str]:
     query = select(
         StoredLogFilter.name
     ).where(
         col(StoredLogFilter.name).startswith(pref),
         col(StoredLogFilter.name).startswith("@") == False
     )
-    with EngineProvider.get_session() as session:
-        return list(session.exec(query).all())  # noqa
+    async with EngineProvider.get_async_session() as session:
+        return list((await session.exec(query)).all())  # noqa
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from discord import Member
+from sqlmodel import select
 
 from config.parameters import get_default_raw, get_description, get_displayed_type, normalize_raw_value
 from db import EngineProvider
@@ -24,23 +25,56 @@ class ParameterDetails:
     current_value: str
 
 
-def get_value(parameter_id: ParameterID, casting_type: type[T] = str) -> T:
+_raw_values: dict[ParameterID, str] | None = None  # Only the overridden values, defaults are taken from the config
+_cast_values: dict[tuple[ParameterID, type], tp.Any] = {}
+
+
+def _load_raw_values() -> None:
+    global _raw_values
+
     with EngineProvider.get_session() as session:
-        result = session.get(ParameterValue, parameter_id)
+        _raw_values = {row.id: row.value for row in session.exec(select(ParameterValue))}
+    _cast_values.clear()
+
+
+EngineProvider.add_load_callback(_load_raw_values)
+
+
+def _set_raw_value(parameter_id: ParameterID, raw: str | None) -> None:
+    if _raw_values is not None:
+        if raw is None:
+            _raw_values.pop(parameter_id, None)
+        else:
+            _raw_values[parameter_id] = raw
 
-    raw = result.value if result else get_default_raw(parameter_id)
+    for casting_type in [cached_type for cached_id, cached_type in _cast_values if cached_id == parameter_id]:
+        del _cast_values[(parameter_id, casting_type)]
+
+
+def get_value(parameter_id: ParameterID, casting_type: type[T] = str) -> T:
+    cache_key = (parameter_id, casting_type)
+    if cache_key in _cast_values:
+        return _cast_values[cache_key]
+
+    if _raw_values is None:
+        _load_raw_values()
+
+    raw = _raw_values.get(parameter_id, get_default_raw(parameter_id))
 
     match casting_type:
         case x if x is bool:
-            return raw == 'true'
+            value = raw == 'true'
         case x if x is int:
-            return int(raw)
+            value = int(raw)
         case x if x is float:
-            return float(raw)
+            value = float(raw)
         case x if x is str:
-            return raw
+            value = raw
         case _:
-            return casting_type(raw)
+            value = casting_type(raw)
+
+    _cast_values[cache_key] = value
+    return value
 
 
 async def update_value(parameter_id: ParameterID, non_normalized_raw_value: str, invoker: Member | None = None) -> None:
@@ -59,6 +93,8 @@ async def update_value(parameter_id: ParameterID, non_normalized_raw_value: str,
         session.add(value_row)
         session.commit()
 
+    _set_raw_value(parameter_id, normalized_raw_value)
+
     await add_entry(LoggedEventTypeID.PARAMETER_EDITED, invoker, dict(
         parameter_id=parameter_id.value,
         value=normalized_raw_value
@@ -73,6 +109,8 @@ async def reset_value(parameter_id: ParameterID, invoker: Member | None = None)
         session.delete(value_row)
         session.commit()
 
+    _set_raw_value(parameter_id, None)
+
     await add_entry(LoggedEventTypeID.PARAMETER_EDITED, invoker, dict(
         parameter_id=parameter_id.value,
         value=get_default_raw(parameter_id)
@@ -3,7 +3,7 @@ from collections import defaultdict
 import discord
 from discord import Member
 from sqlalchemy import Select
-from sqlmodel import col, select
+from sqlmodel import select
 
 from db import EngineProvider
 from db.models import PermissionFlag
@@ -12,26 +12,39 @@ from util.exceptions import AlreadySatisfiesError
 from util.identifiers import LoggedEventTypeID, PermissionFlagID
 
 
-def has_permission(member: discord.Member, permission: PermissionFlagID | list[PermissionFlagID], allow_admin: bool = True) -> bool:
-    member_roles = set(map(lambda role: role.id, member.roles))
+_role_ids_by_permission: dict[PermissionFlagID, frozenset[int]] | None = None
+
 
+def _rebuild_index() -> None:
+    global _role_ids_by_permission
+
+    role_ids_by_permission = defaultdict(set)
     with EngineProvider.get_session() as session:
-        if isinstance(permission, PermissionFlagID):
-            checked_flags = [permission]
-        else:
-            checked_flags = permission
-        if allow_admin:
-            checked_flags.append(PermissionFlagID.ADMIN)
-        query: Select = select(PermissionFlag.role_id).where(col(PermissionFlag.id).in_(checked_flags))
-        required_roles = set(session.exec(query))
+        for entry in session.exec(select(PermissionFlag)):
+            role_ids_by_permission[entry.id].add(entry.role_id)
+    _role_ids_by_permission = {permission: frozenset(role_ids) for permission, role_ids in role_ids_by_permission.items()}
+
+
+EngineProvider.add_load_callback(_rebuild_index)
+
+
+def _get_role_ids(permission: PermissionFlagID) -> frozenset[int]:
+    if _role_ids_by_permission is None:
+        _rebuild_index()
+    return _role_ids_by_permission.get(permission, frozenset())
 
-    return bool(member_roles & required_roles)
+
+def has_permission(member: discord.Member, permission: PermissionFlagID | list[PermissionFlagID], allow_admin: bool = True) -> bool:
+    checked_flags = [permission] if isinstance(permission, PermissionFlagID) else list(permission)
+    if allow_admin:
+        checked_flags.append(PermissionFlagID.ADMIN)
+
+    member_roles = set(map(lambda role: role.id, member.roles))
+    return any(not member_roles.isdisjoint(_get_role_ids(flag)) for flag in checked_flags)
 
 
 async def get_permission_role_ids(permission: PermissionFlagID) -> set[int]:
-    with EngineProvider.get_session() as session:
-        query = select(PermissionFlag.role_id).where(PermissionFlag.id == permission)
-        return set(session.exec(query))  # noqa
+    return set(_get_role_ids(permission))
 
 
 async def bind(role: discord.Role, permission: PermissionFlagID, invoker: Member | None = None) -> None:
@@ -44,6 +57,8 @@ async def bind(role: discord.Role, permission: PermissionFlagID, invoker: Member
         session.add(new_entry)
         session.commit()
 
+    _rebuild_index()
+
     await add_entry(LoggedEventTypeID.PERMISSION_BOUND, invoker, dict(
         permission_id=permission.value,
         role_id=str(role.id)
@@ -59,6 +74,8 @@ async def unbind(role: discord.Role, permission: PermissionFlagID, invoker: Memb
         session.delete(existing_entry)
         session.commit()
 
+    _rebuild_index()
+
     await add_entry(LoggedEventTypeID.PERMISSION_UNBOUND, invoker, dict(
         permission_id=permission.value,
         role_id=str(role.id)
@@ -78,6 +95,8 @@ async def clear(role: discord.Role, invoker: Member | None = None) -> None:
 
         session.commit()
 
+    _rebuild_index()
+
     await add_entry(LoggedEventTypeID.ROLE_CLEARED_FROM_PERMISSIONS, invoker, dict(
         role_id=str(role.id)
     ))
@@ -95,6 +114,4 @@ def list_bound_roles(member: discord.Member | None = None) -> dict[int, list[Per
 
 
 def is_permission_assigned(permission: PermissionFlagID) -> bool:
-    with EngineProvider.get_session() as session:
-        query: Select = select(PermissionFlag).where(PermissionFlag.id == permission)
-        return bool(session.exec(query).first())
+    return bool(_get_role_ids(permission))
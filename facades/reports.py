@@ -5,8 +5,9 @@ from enum import StrEnum
 from discord import Member
 from plotly.graph_objs import Figure
 from sqlalchemy import func
-from sqlmodel import col, distinct, select
+from sqlmodel import distinct, select
 
+from facades.eventlog import custom_field_equals
 from facades.parameters import get_value as get_parameter_value
 from db import EngineProvider
 
@@ -16,7 +17,7 @@ import plotly.express as px
 import typing as tp
 
 from db.models import LoggedEvent, Request, RequestOpinion, RequestReview
-from services.disc import find_member
+from services.disc import find_members
 from util.datatypes import Opinion, ReportRange, SimpleReportRange
 from util.identifiers import LoggedEventTypeID, ParameterID
 from util.time import to_start_of_day
@@ -78,7 +79,7 @@ async def new_requests(report_range: ReportRange) -> str | None:
                     LoggedEvent
                 ).where(
                     LoggedEvent.event_type == LoggedEventTypeID.PARAMETER_EDITED,
-                    col(LoggedEvent.custom_data).contains('"parameter_id": "queue.blocked"')
+                    custom_field_equals("parameter_id", "queue.blocked")
                 ),
                 LoggedEvent.timestamp
             ).order_by(
@@ -133,10 +134,10 @@ async def pending_requests(report_range: ReportRange) -> str | None:
             ).one()
             resolved_before_range_start: int = session.exec(
                 select(  # noqa
-                    func.count(distinct(RequestOpinion.request_id))
+                    func.count(Request.id)
                 ).where(
-                    RequestOpinion.is_resolution == True,  # noqa
-                    RequestOpinion.created_at < report_range.get_inclusive_min_datetime()
+                    Request.resolved_at != None,  # noqa
+                    Request.resolved_at < report_range.get_inclusive_min_datetime()
                 )
             ).one()
         a_priori_pending_requests = created_before_range_start - resolved_before_range_start
@@ -153,12 +154,11 @@ async def pending_requests(report_range: ReportRange) -> str | None:
     )
     resolutions_query = report_range.restrict_query(
         select(  # noqa
-            LoggedEvent.timestamp
+            Request.resolved_at
         ).where(
-            LoggedEvent.event_type == LoggedEventTypeID.REQUEST_RESOLUTION_ADDED,
-            col(LoggedEvent.custom_data).contains('"is_first": "True"')
+            Request.resolved_at != None,  # noqa
         ),
-        LoggedEvent.timestamp
+        Request.resolved_at
     )
 
     with EngineProvider.get_session() as session:
@@ -269,12 +269,12 @@ async def review_activity(report_range: ReportRange) -> str | None:
                 ),
                 RequestReview.created_at
             )
-        )
+        ).all()
 
     data_with_gaps = defaultdict(int)
     range_start = report_range.get_first_bin_value()
     range_end = report_range.get_last_bin_value()
-    reviewers_by_id = dict()
+    reviewers_by_id = await find_members(author_user_id for author_user_id, _ in result)
     for author_user_id, created_at in result:  # noqa
         current_bin = report_range.get_bin(created_at).value
         if not range_start or current_bin < range_start:
@@ -282,13 +282,7 @@ async def review_activity(report_range: ReportRange) -> str | None:
         if not range_end or current_bin > range_end:
             range_end = current_bin
 
-        if author_user_id not in reviewers_by_id:
-            reviewer = await find_member(author_user_id)
-            reviewers_by_id[author_user_id] = reviewer
-        else:
-            reviewer = reviewers_by_id[author_user_id]
-
-        if reviewer:
+        if reviewers_by_id[author_user_id]:
             data_with_gaps[(author_user_id, current_bin)] += 1
 
     reviewers = [reviewer for reviewer in reviewers_by_id.values() if reviewer]
@@ -1,9 +1,11 @@
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, UTC
 
 from discord import Colour, Embed, Member, Message
 from sqlalchemy import func
 from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from components.views.pending_request_widget import PendingRequestWidgetView
 from components.views.resolution_widget import ResolutionWidgetView
@@ -12,10 +14,10 @@ from db.models import Request, RequestOpinion, RequestReview
 from facades.eventlog import add_entry
 from facades.parameters import get_value as get_parameter_value, update_value as update_parameter_value
 from facades.texts import render_text
-from services.disc import find_message, post, post_raw_text, safe_delete_message
-from services.gd import get_level
+from services.disc import edit_message, find_message, find_messages, forget_message, post, post_raw_text, safe_delete_message
+from services.gd import get_level, invalidate_level
 from services.yt import get_video_id_by_url
-from util.datatypes import Language, Opinion, SendType
+from util.datatypes import Language, Opinion, RequestState, SendType
 from util.exceptions import AlreadySatisfiesError
 from util.format import as_code, as_code_block, as_link, as_user
 from util.identifiers import LoggedEventTypeID, ParameterID, RouteID, TextPieceID
@@ -54,85 +56,128 @@ class NotFoundException(Exception):
     pass
 
 
-def assert_level_requestable(level_id: int) -> None:
+_pending_count: int | None = None
+_pending_count_lock = asyncio.Lock()  # Held by the recounts and by the commits that change the count, so that a recount never sees one without the other
+
+
+def _count_pending_query():
+    return select(func.count(Request.id)).where(Request.state == RequestState.PENDING)
+
+
+def _load_pending_count() -> None:
+    global _pending_count
     with EngineProvider.get_session() as session:
-        approved_query = select(RequestOpinion).join(Request).where(
-            Request.level_id == level_id,  # noqa
-            RequestOpinion.is_resolution == True,  # noqa
-            RequestOpinion.opinion == Opinion.APPROVED
-        )
-        approved_request_opinion: RequestOpinion = session.exec(approved_query).first()  # noqa
-        if approved_request_opinion:
-            raise LevelAlreadyApprovedException(approved_request_opinion.request.request_author_mention, approved_request_opinion.request.requested_at, approved_request_opinion.created_at)
+        _pending_count = session.exec(_count_pending_query()).one() or 0  # noqa
+
+
+EngineProvider.add_load_callback(_load_pending_count)
+
+
+async def _commit_adjusting_pending_count(session: AsyncSession, delta: int) -> None:
+    global _pending_count
+    async with _pending_count_lock:
+        await session.commit()
+        if _pending_count is not None:
+            _pending_count += delta
 
-        resolved_request_ids = select(RequestOpinion.request_id).where(RequestOpinion.is_resolution == True)
-        pending_query = select(Request).where(Request.level_id == level_id, Request.requested_at != None, ~col(Request.id).in_(resolved_request_ids))  # noqa
-        pending_request: Request = session.exec(pending_query).first()  # noqa
+
+async def reconcile_pending_count() -> int:
+    """
+    Recounts the pending requests in the database, returning the drift of the in-memory counter
+    """
+    global _pending_count
+    async with _pending_count_lock:
+        async with EngineProvider.get_async_session() as session:
+            actual_count = (await session.exec(_count_pending_query())).one() or 0  # noqa
+        drift = actual_count - _pending_count if _pending_count is not None else 0
+        _pending_count = actual_count
+    return drift
+
+
+async def assert_level_requestable(level_id: int) -> None:
+    async with EngineProvider.get_async_session() as session:
+        approved_query = select(Request).where(Request.level_id == level_id, Request.state == RequestState.APPROVED)
+        approved_request: Request = (await session.exec(approved_query)).first()  # noqa
+        if approved_request:
+            # resolved_at marks the first resolution, which may have been a rejection, so the approval time comes from the approving opinion
+            approved_at_query = select(func.min(RequestOpinion.created_at)).where(
+                RequestOpinion.request_id == approved_request.id,
+                RequestOpinion.is_resolution == True,  # noqa
+                RequestOpinion.opinion == Opinion.APPROVED
+            )
+            approved_at: datetime | None = (await session.exec(approved_at_query)).one()  # noqa
+            raise LevelAlreadyApprovedException(approved_request.request_author_mention, approved_request.requested_at, approved_at or approved_request.resolved_at)
+
+        pending_query = select(Request).where(Request.level_id == level_id, Request.state == RequestState.PENDING)
+        pending_request: Request = (await session.exec(pending_query)).first()  # noqa
         if pending_request:
             raise PreviousLevelRequestPendingException(pending_request.request_author_mention, pending_request.requested_at)
 
 
 async def get_request_by_id(request_id: int) -> Request | None:
-    with EngineProvider.get_session() as session:
-        return session.get(Request, request_id)
+    async with EngineProvider.get_async_session() as session:
+        return await session.get(Request, request_id)
+
+
+async def mark_details_messages_deleted(request_ids: list[int]) -> None:
+    async with EngineProvider.get_async_session() as session:
+        for request in await session.exec(select(Request).where(col(Request.id).in_(request_ids))):
+            request.is_details_message_deleted = True
+            session.add(request)
+        await session.commit()
 
 
 async def get_last_complete_request(level_id: int) -> Request | None:
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         query = select(Request).where(Request.level_id == level_id, Request.requested_at != None).order_by(col(Request.requested_at).desc())  # noqa
-        return session.exec(query).first()  # noqa
+        return (await session.exec(query)).first()  # noqa
 
 
 async def is_request_unresolved(request_id: int) -> bool:
-    with EngineProvider.get_session() as session:
-        query = select(RequestOpinion.request_id).where(RequestOpinion.request_id == request_id, RequestOpinion.is_resolution == True)
-        return session.exec(query).first() is None
+    async with EngineProvider.get_async_session() as session:
+        query = select(Request.state).where(Request.id == request_id)
+        return (await session.exec(query)).first() not in (RequestState.APPROVED, RequestState.REJECTED)
 
 
 async def get_latest_pending_request(level_id: int) -> Request | None:
-    with EngineProvider.get_session() as session:
-        resolved_request_ids = select(RequestOpinion.request_id).where(RequestOpinion.is_resolution == True)
+    async with EngineProvider.get_async_session() as session:
         query = select(
             Request
         ).where(
             Request.level_id == level_id,
-            Request.requested_at != None,  # noqa
-            ~col(Request.id).in_(resolved_request_ids)
+            Request.state == RequestState.PENDING
         ).order_by(
             col(Request.requested_at).desc()
         )
-        return session.exec(query).first()  # noqa
+        return (await session.exec(query)).first()  # noqa
 
 
 async def get_oldest_ignored_request() -> Request | None:
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         query = select(Request).where(Request.resolution_message_id == None, Request.requested_at != None).order_by(Request.requested_at)  # noqa
-        return session.exec(query).first()  # noqa
+        return (await session.exec(query)).first()  # noqa
 
 
 async def get_oldest_unresolved_request() -> Request | None:
-    with EngineProvider.get_session() as session:
-        resolved_request_ids = select(RequestOpinion.request_id).where(RequestOpinion.is_resolution == True)
+    async with EngineProvider.get_async_session() as session:
         query = select(Request).where(
-            ~col(Request.id).in_(resolved_request_ids),
+            Request.state == RequestState.PENDING,
             Request.resolution_message_id != None,  # noqa
             Request.resolution_message_channel_id != None  # noqa
         ).order_by(Request.requested_at)
-        return session.exec(query).first()  # noqa
+        return (await session.exec(query)).first()  # noqa
 
 
 async def get_pending_request(oldest: bool) -> Request | None:
-    with EngineProvider.get_session() as session:
-        resolved_request_ids = select(RequestOpinion.request_id).where(RequestOpinion.is_resolution == True)
+    async with EngineProvider.get_async_session() as session:
         query = select(
             Request
         ).where(
-            ~col(Request.id).in_(resolved_request_ids),
-            Request.requested_at != None  # noqa
+            Request.state == RequestState.PENDING
         ).order_by(
             Request.requested_at if oldest else func.random()
         )
-        return session.exec(query).first()  # noqa
+        return (await session.exec(query)).first()  # noqa
 
 
 async def create_limbo_request(level_id: int, request_language: Language, invoker: Member, creator: Member | str | None = None) -> int:
@@ -147,7 +192,7 @@ async def create_limbo_request(level_id: int, request_language: Language, invoke
             request_author = str(invoker.id)
             is_author_user_id = True
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         new_entry = Request(
             level_id=level_id,
             language=request_language,
@@ -155,7 +200,7 @@ async def create_limbo_request(level_id: int, request_language: Language, invoke
             is_author_user_id=is_author_user_id
         )
         session.add(new_entry)
-        session.commit()
+        await session.commit()
 
         request_id = new_entry.id
 
@@ -176,8 +221,8 @@ async def complete_request(request_id: int, yt_link: str | None, additional_comm
     else:
         yt_video_id = None
 
-    with EngineProvider.get_session() as session:
-        request = session.get(Request, request_id)
+    async with EngineProvider.get_async_session() as session:
+        request = await session.get(Request, request_id)
 
         level_id = request.level_id
         level = await get_level(level_id)
@@ -215,10 +260,13 @@ async def complete_request(request_id: int, yt_link: str | None, additional_comm
         request.additional_comment = additional_comment
         request.details_message_id = message.id
         request.details_message_channel_id = message.channel.id
+        request.is_details_message_deleted = False
         request.requested_at = datetime.now(UTC)
+        was_limbo = request.state == RequestState.LIMBO
+        request.state = RequestState.PENDING
 
         session.add(request)
-        session.commit()
+        await _commit_adjusting_pending_count(session, 1 if was_limbo else 0)
 
     if allow_queue_closing and get_parameter_value(ParameterID.QUEUE_BLOCK_ENABLED, bool) and get_parameter_value(ParameterID.QUEUE_BLOCK_AT, int) <= await count_pending_requests():
         try:
@@ -275,7 +323,8 @@ async def _append_opinion_to_resolution_widget(resolution_widget: Message, revie
             resolution_embed.add_field(name="Consensus", value='\n'.join(lines), inline=False)
             break
 
-    await resolution_widget.edit(
+    await edit_message(
+        resolution_widget,
         embed=resolution_embed
     )
 
@@ -305,7 +354,8 @@ async def _append_resolution_to_resolution_widget(resolution_widget: Message, re
 
     resolution_embed.colour = Colour.from_str("#128611")
 
-    await resolution_widget.edit(
+    await edit_message(
+        resolution_widget,
         embed=resolution_embed
     )
 
@@ -358,34 +408,30 @@ async def _post_review(reviewer: Member, request: Request, opinion: Opinion, rev
 
 
 async def get_existing_opinion(reviewer: Member, request_id: int, resolution_only: bool = False) -> RequestOpinion | None:
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         query = select(RequestOpinion).where(RequestOpinion.request_id == request_id, RequestOpinion.author_user_id == reviewer.id)
         if resolution_only:
             query = query.where(RequestOpinion.is_resolution == True)
         query = query.order_by(col(RequestOpinion.created_at).desc())
-        return session.exec(query).first()  # noqa
+        return (await session.exec(query)).first()  # noqa
 
 
 async def get_existing_review(reviewer: Member, request_id: int) -> RequestReview | None:
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         query = select(RequestReview).where(RequestReview.request_id == request_id, RequestReview.author_user_id == reviewer.id)
         query = query.order_by(col(RequestReview.created_at).desc())
-        return session.exec(query).first()  # noqa
+        return (await session.exec(query)).first()  # noqa
 
 
 async def count_pending_requests() -> int:
-    resolved_request_ids = select(RequestOpinion.request_id).where(RequestOpinion.is_resolution == True)
-    query = select(func.count(Request.id)).where(
-        Request.requested_at != None,    # noqa
-        ~col(Request.id).in_(resolved_request_ids)
-    )
-    with EngineProvider.get_session() as session:
-        return session.exec(query).one() or 0  # noqa
+    if _pending_count is None:
+        await reconcile_pending_count()
+    return _pending_count
 
 
 async def add_opinion(reviewer: Member, request_id: int, opinion: Opinion, review_widget_message: Message | None = None, review_text: str | None = None, reason: str | None = None) -> None:
-    with EngineProvider.get_session() as session:
-        request: Request = session.get(Request, request_id)  # noqa
+    async with EngineProvider.get_async_session() as session:
+        request: Request = await session.get(Request, request_id)  # noqa
         assert request
 
         # Eagerly reading all the properties so as not to trigger entity refresh later
@@ -405,11 +451,11 @@ async def add_opinion(reviewer: Member, request_id: int, opinion: Opinion, revie
                 message_id=associated_review_message.id,
                 message_channel_id=associated_review_message.channel.id,
                 opinion=opinion,
-                request=request
+                request_id=request_id
             )
             session.add(associated_review)
 
-        request.opinions.append(RequestOpinion(
+        session.add(RequestOpinion(
             author_user_id=reviewer.id,
             opinion=opinion,
             request_id=request_id,
@@ -444,7 +490,7 @@ async def add_opinion(reviewer: Member, request_id: int, opinion: Opinion, revie
             request.resolution_message_channel_id = resolution_message.channel.id
 
         session.add(request)
-        session.commit()
+        await session.commit()
 
     await add_entry(LoggedEventTypeID.REQUEST_OPINION_ADDED, reviewer, dict(
         request_id=str(request_id),
@@ -460,8 +506,8 @@ async def add_opinion(reviewer: Member, request_id: int, opinion: Opinion, revie
 async def resolve(resolving_mod: Member, request_id: int, sent_for: SendType | None, review_text: str | None = None, reason: str | None = None) -> bool:
     opinion = Opinion.APPROVED if sent_for else Opinion.REJECTED
 
-    with EngineProvider.get_session() as session:
-        request: Request = session.get(Request, request_id)  # noqa
+    async with EngineProvider.get_async_session() as session:
+        request: Request = await session.get(Request, request_id)  # noqa
         if not request:
             return False
 
@@ -480,11 +526,11 @@ async def resolve(resolving_mod: Member, request_id: int, sent_for: SendType | N
                 message_id=associated_review_message.id,
                 message_channel_id=associated_review_message.channel.id,
                 opinion=opinion,
-                request=request
+                request_id=request_id
             )
             session.add(associated_review)
 
-        request.opinions.append(RequestOpinion(
+        session.add(RequestOpinion(
             author_user_id=resolving_mod.id,
             opinion=opinion,
             is_resolution=True,
@@ -493,9 +539,10 @@ async def resolve(resolving_mod: Member, request_id: int, sent_for: SendType | N
         ))
 
         formatted_reasoning = _render_reasoning(associated_review_message, reason)
-        resolution_widget = await find_message(request.resolution_message_channel_id, request.resolution_message_id)
-
-        review_widget = await find_message(request.details_message_channel_id, request.details_message_id)
+        resolution_widget, review_widget = await find_messages([
+            (request.resolution_message_channel_id, request.resolution_message_id),
+            (request.details_message_channel_id, request.details_message_id)
+        ])
         assert review_widget
         review_widget_embed = review_widget.embeds[0]
 
@@ -519,11 +566,21 @@ async def resolve(resolving_mod: Member, request_id: int, sent_for: SendType | N
 
             request.details_message_id = archive_message.id
             request.details_message_channel_id = archive_message.channel.id
+            request.is_details_message_deleted = False
 
             await review_widget.delete()
+            forget_message(review_widget.channel.id, review_widget.id, deleted=True)
+
+        if not request.resolved_at:
+            request.resolved_at = datetime.now(UTC)
+        was_pending = request.state == RequestState.PENDING
+        if request.state != RequestState.APPROVED:
+            request.state = RequestState.APPROVED if opinion == Opinion.APPROVED else RequestState.REJECTED
 
         session.add(request)
-        session.commit()
+        await _commit_adjusting_pending_count(session, -1 if was_pending else 0)
+
+        invalidate_level(level_id)
 
         if opinion == Opinion.APPROVED:
             grade_text_pieces = {
@@ -594,16 +651,18 @@ async def resolve(resolving_mod: Member, request_id: int, sent_for: SendType | N
 
 
 async def delete_request(request_id: int, invoker: Member) -> None:
-    with EngineProvider.get_session() as session:
-        request: Request = session.get(Request, request_id)  # noqa
+    async with EngineProvider.get_async_session() as session:
+        request: Request = await session.get(Request, request_id)  # noqa
         if not request:
             raise NotFoundException
 
+        was_pending = request.state == RequestState.PENDING
+
         await safe_delete_message(request.resolution_message_channel_id, request.resolution_message_id)
         await safe_delete_message(request.details_message_channel_id, request.details_message_id)
 
-        session.delete(request)
-        session.commit()
+        await session.delete(request)
+        await _commit_adjusting_pending_count(session, -1 if was_pending else 0)
 
     await add_entry(LoggedEventTypeID.REQUEST_DELETED, invoker, dict(
         request_id=str(request_id)
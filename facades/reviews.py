@@ -1,33 +1,49 @@
 from dataclasses import dataclass
 
 from discord import Member
-from sqlmodel import select
+from sqlmodel import col, select
 
 from db import EngineProvider
 from db.models import Request, RequestReview
+from util.datatypes import PageCursor, Seek
 
 
 @dataclass
 class UserReviewData:
+    cursor: PageCursor
+    review_id: int
     level_name: str
     message_channel_id: int
     message_id: int
+    is_message_deleted: bool
 
 
 async def get_level_reviews(level_id: int) -> list[RequestReview]:
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         query = select(RequestReview).join(Request).where(Request.level_id == level_id, RequestReview.is_trainee == False).order_by(RequestReview.created_at)  # noqa
-        return [x for x in session.exec(query)]  # noqa
+        return [x for x in await session.exec(query)]  # noqa
 
 
-async def get_user_reviews(author: Member, limit: int, offset: int) -> list[UserReviewData]:
+async def get_user_reviews(author: Member, limit: int, seek: Seek = Seek()) -> list[UserReviewData]:
     reviews = []
-    with EngineProvider.get_session() as session:
-        query = select(RequestReview).where(RequestReview.author_user_id == author.id).order_by(RequestReview.created_at).limit(limit).offset(offset)
-        for review in session.exec(query):  # noqa
+    async with EngineProvider.get_async_session() as session:
+        query = select(RequestReview, Request.level_name).outerjoin(Request).where(RequestReview.author_user_id == author.id)
+        query = seek.restrict_query(query, col(RequestReview.created_at), col(RequestReview.id), limit)
+        for review, level_name in await session.exec(query):  # noqa
             reviews.append(UserReviewData(
-                level_name=review.request.level_name if review.request else "DELETED",
+                cursor=PageCursor(review.created_at, review.id),
+                review_id=review.id,
+                level_name=level_name if review.request_id else "DELETED",
                 message_channel_id=review.message_channel_id,
-                message_id=review.message_id
+                message_id=review.message_id,
+                is_message_deleted=review.is_message_deleted
             ))
-    return reviews
\ No newline at end of file
+    return seek.to_page_order(reviews)
+
+
+async def mark_review_messages_deleted(review_ids: list[int]) -> None:
+    async with EngineProvider.get_async_session() as session:
+        for review in await session.exec(select(RequestReview).where(col(RequestReview.id).in_(review_ids))):
+            review.is_message_deleted = True
+            session.add(review)
+        await session.commit()
\ No newline at end of file
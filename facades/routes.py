@@ -1,11 +1,14 @@
 from dataclasses import dataclass
 
 from discord import Member
+from discord.abc import Messageable
+from sqlmodel import select
 
 from config.routes import get_default_channel_id, get_description
 from db import EngineProvider
 from db.models import Route
 from facades.eventlog import add_entry
+from globalconf import CONFIG
 from util.exceptions import AlreadySatisfiesError
 from util.identifiers import LoggedEventTypeID, RouteID
 
@@ -18,20 +21,50 @@ class RouteDetails:
     is_enabled: bool
 
 
-def get_channel_id(route_id: RouteID) -> int:
+@dataclass
+class ResolvedRoute:
+    channel_id: int
+    enabled: bool
+    channel: Messageable | None = None  # Filled lazily, as channels only become available once the bot is ready
+
+
+_resolved_routes: dict[RouteID, ResolvedRoute] | None = None
+
+
+def _resolve_routes() -> None:
+    global _resolved_routes
+
     with EngineProvider.get_session() as session:
-        result = session.get(Route, route_id)
+        rows = {route.id: route for route in session.exec(select(Route))}
+
+    _resolved_routes = {}
+    for route_id in RouteID:
+        row = rows.get(route_id)
+        _resolved_routes[route_id] = ResolvedRoute(
+            channel_id=row.channel_id if row and row.channel_id else get_default_channel_id(route_id),
+            enabled=row.enabled if row else True
+        )
+
+
+EngineProvider.add_load_callback(_resolve_routes)
 
-    if result and result.channel_id:
-        return result.channel_id
 
-    return get_default_channel_id(route_id)
+def resolve(route_id: RouteID) -> ResolvedRoute:
+    if _resolved_routes is None:
+        _resolve_routes()
+
+    resolved = _resolved_routes[route_id]
+    if resolved.channel is None:
+        resolved.channel = CONFIG.bot.get_channel(resolved.channel_id)
+    return resolved
+
+
+def get_channel_id(route_id: RouteID) -> int:
+    return resolve(route_id).channel_id
 
 
 def is_enabled(route_id: RouteID) -> bool:
-    with EngineProvider.get_session() as session:
-        result = session.get(Route, route_id)
-    return result.enabled if result else True
+    return resolve(route_id).enabled
 
 
 async def update_channel_id(route_id: RouteID, channel_id: int, invoker: Member | None = None) -> None:
@@ -50,6 +83,8 @@ async def update_channel_id(route_id: RouteID, channel_id: int, invoker: Member
         session.add(route)
         session.commit()
 
+    _resolve_routes()
+
     await add_entry(LoggedEventTypeID.ROUTE_TARGET_UPDATED, invoker, dict(
         route_id=route_id.value,
         new_channel_id=str(channel_id)
@@ -72,6 +107,8 @@ async def reset_channel_id(route_id: RouteID, invoker: Member | None = None) ->
 
         session.commit()
 
+    _resolve_routes()
+
     await add_entry(LoggedEventTypeID.ROUTE_TARGET_UPDATED, invoker, dict(
         route_id=route_id.value,
         new_channel_id=str(get_default_channel_id(route_id))
@@ -92,6 +129,8 @@ async def enable(route_id: RouteID, invoker: Member | None = None) -> None:
 
         session.commit()
 
+    _resolve_routes()
+
     await add_entry(LoggedEventTypeID.ROUTE_TOGGLED, invoker, dict(
         route_id=route_id.value,
         enabled="True"
@@ -112,6 +151,8 @@ async def disable(route_id: RouteID, invoker: Member | None = None) -> None:
         session.add(route)
         session.commit()
 
+    _resolve_routes()
+
     await add_entry(LoggedEventTypeID.ROUTE_TOGGLED, invoker, dict(
         route_id=route_id.value,
         enabled="False"
@@ -1,6 +1,8 @@
+import re
 from dataclasses import dataclass
 
 from discord import Member
+from sqlmodel import select
 
 from config.texts import get_default_template, get_description, get_param_descriptions
 from db import EngineProvider
@@ -21,10 +23,53 @@ class TextPieceDetails:
     current_templates: dict[Language, str]
 
 
-def get_template(piece_id: TextPieceID, lang: Language) -> str:
+PLACEHOLDER_PATTERN = re.compile(r'\{([^{}]*)}')
+
+_overrides: dict[tuple[TextPieceID, Language], str] | None = None
+_compiled_templates: dict[tuple[TextPieceID, Language], list[str]] = {}  # Literal segments at even indices, placeholder names at odd ones
+_overrides_revision = 0  # Bumped whenever a database (re)load brings different overrides, so that the command tree gets re-synced
+
+
+def _load_overrides() -> None:
+    global _overrides, _overrides_revision
+
     with EngineProvider.get_session() as session:
-        result = session.get(TextPiece, (piece_id, lang))
-    return result.template if result else get_default_template(piece_id, lang)
+        overrides = {(piece.id, piece.language): piece.template for piece in session.exec(select(TextPiece))}
+    if overrides != _overrides:
+        _overrides_revision += 1
+    _overrides = overrides
+    _compiled_templates.clear()
+
+
+def get_overrides_revision() -> int:
+    return _overrides_revision
+
+
+EngineProvider.add_load_callback(_load_overrides)
+
+
+def _set_override(piece_id: TextPieceID, lang: Language, template: str | None) -> None:
+    if _overrides is not None:
+        if template is None:
+            _overrides.pop((piece_id, lang), None)
+        else:
+            _overrides[(piece_id, lang)] = template
+    _compiled_templates.pop((piece_id, lang), None)
+
+
+def get_template(piece_id: TextPieceID, lang: Language) -> str:
+    if _overrides is None:
+        _load_overrides()
+    override = _overrides.get((piece_id, lang))
+    return override if override is not None else get_default_template(piece_id, lang)
+
+
+def _get_compiled_template(piece_id: TextPieceID, lang: Language) -> list[str]:
+    compiled = _compiled_templates.get((piece_id, lang))
+    if compiled is None:
+        compiled = PLACEHOLDER_PATTERN.split(get_template(piece_id, lang))
+        _compiled_templates[(piece_id, lang)] = compiled
+    return compiled
 
 
 async def update_template(piece_id: TextPieceID, lang: Language, new_text: str, invoker: Member | None = None) -> None:
@@ -41,6 +86,8 @@ async def update_template(piece_id: TextPieceID, lang: Language, new_text: str,
         session.add(piece)
         session.commit()
 
+    _set_override(piece_id, lang, new_text)
+
     await add_entry(LoggedEventTypeID.TEXT_PIECE_EDITED, invoker, dict(
         piece_id=piece_id.value,
         lang=lang.value,
@@ -56,6 +103,8 @@ async def reset_template(piece_id: TextPieceID, lang: Language, invoker: Member
         session.delete(piece)
         session.commit()
 
+    _set_override(piece_id, lang, None)
+
     await add_entry(LoggedEventTypeID.TEXT_PIECE_EDITED, invoker, dict(
         piece_id=piece_id.value,
         lang=lang.value,
@@ -67,13 +116,16 @@ def render_text(piece_id: TextPieceID, lang: Language, substitutions: dict[str,
     if substitutions is None:
         substitutions = {}
 
-    s = get_template(piece_id, lang)
-    for key, value in substitutions.items():
-        s = s.replace(
-            '{' + key + '}',
-            render_text(value, lang) if isinstance(value, TextPieceID) else str(value)
-        )
-    return s
+    rendered_segments = []
+    for index, segment in enumerate(_get_compiled_template(piece_id, lang)):
+        if index % 2 == 0:
+            rendered_segments.append(segment)
+        elif segment in substitutions:
+            value = substitutions[segment]
+            rendered_segments.append(render_text(value, lang) if isinstance(value, TextPieceID) else str(value))
+        else:
+            rendered_segments.append('{' + segment + '}')
+    return ''.join(rendered_segments)
 
 
 def explain(piece_id: TextPieceID) -> TextPieceDetails:
@@ -10,7 +10,7 @@ from db.models import Request, RequestReview, TraineeReviewOpinion
 from facades.eventlog import add_entry
 from facades.permissions import get_permission_role_ids, has_permission
 from facades.texts import render_text
-from services.disc import find_message, find_member, get_default_role, post_raw_text
+from services.disc import edit_message, find_message, find_member, get_default_role, post_raw_text
 from util.datatypes import Language, Opinion
 from util.format import as_code, as_link, as_user
 from util.identifiers import LoggedEventTypeID, PermissionFlagID, RouteID, TextPieceID
@@ -46,8 +46,8 @@ class RandomPickedRequest:
 
 
 async def add_trainee_review(trainee: Member, request_id: int, opinion: Opinion, review_text: str, rejection_reason: str | None = None) -> None:
-    with EngineProvider.get_session() as session:
-        request: Request = session.get(Request, request_id)  # noqa
+    async with EngineProvider.get_async_session() as session:
+        request: Request = await session.get(Request, request_id)  # noqa
 
         assert request
 
@@ -85,19 +85,19 @@ async def add_trainee_review(trainee: Member, request_id: int, opinion: Opinion,
         "\n".join(message_lines)
     )
 
-    with EngineProvider.get_session() as session:
+    async with EngineProvider.get_async_session() as session:
         review = RequestReview(
             author_user_id=trainee.id,
             text=review_text,
             message_id=review_message.id,
             message_channel_id=review_message.channel.id,
             opinion=opinion,
-            request=request,
+            request_id=request_id,
             is_trainee=True
         )
         session.add(review)
-        session.commit()
-        await review_message.edit(view=TraineeReviewWidgetView(review.id))
+        await session.commit()
+        await edit_message(review_message, view=TraineeReviewWidgetView(review.id))
 
     await add_entry(LoggedEventTypeID.TRAINEE_REVIEW_ADDED, trainee, dict(
         request_id=str(request_id),
@@ -109,8 +109,8 @@ async def add_trainee_review(trainee: Member, request_id: int, opinion: Opinion,
 
 
 async def resolve_trainee_review(supervisor: Member, review_id: int, accept: bool, feedback: str | None = None) -> TraineeStats:
-    with EngineProvider.get_session() as session:
-        review = session.get(RequestReview, review_id)
+    async with EngineProvider.get_async_session() as session:
+        review = await session.get(RequestReview, review_id)
         trainee_user_id = review.author_user_id
 
         opinion = TraineeReviewOpinion(
@@ -120,7 +120,7 @@ async def resolve_trainee_review(supervisor: Member, review_id: int, accept: boo
             review_id=review_id
         )
         session.add(opinion)
-        session.commit()
+        await session.commit()
 
         review_message = await find_message(review.message_channel_id, review.message_id)
 
@@ -128,22 +128,22 @@ async def resolve_trainee_review(supervisor: Member, review_id: int, accept: boo
     if review_message:
         review_reference = review_message.jump_url
 
-        await review_message.edit(view=None)
+        await edit_message(review_message, view=None)
 
         if feedback:
             thread = await review_message.create_thread(name="Feedback", auto_archive_duration=60)
             await thread.send(as_user(trainee_user_id) + "\n" + feedback)
 
-    with EngineProvider.get_session() as session:
-        review_cnt = session.exec(
+    async with EngineProvider.get_async_session() as session:
+        review_cnt = (await session.exec(
             select(func.count(RequestReview.id)).where(RequestReview.is_trainee == True, RequestReview.author_user_id == trainee_user_id)  # noqa
-        ).first() or 0
-        resolved_review_cnt = session.exec(
+        )).first() or 0
+        resolved_review_cnt = (await session.exec(
             select(func.count(TraineeReviewOpinion.review_id)).join(RequestReview).where(RequestReview.author_user_id == trainee_user_id)  # noqa
-        ).first() or 0
-        accepted_review_cnt = session.exec(
+        )).first() or 0
+        accepted_review_cnt = (await session.exec(
             select(func.count(TraineeReviewOpinion.review_id)).join(RequestReview).where(TraineeReviewOpinion.accept == True, RequestReview.author_user_id == trainee_user_id)  # noqa
-        ).first() or 0
+        )).first() or 0
 
     await add_entry(LoggedEventTypeID.TRAINEE_REVIEW_RESOLVED, supervisor, dict(
         review=review_reference,
@@ -218,8 +218,8 @@ async def expel_trainee(trainee_or_user_id: int | Member, supervisor: Member) ->
 
 
 async def pick_random_request(invoking_trainee: Member) -> RandomPickedRequest | None:
-    with EngineProvider.get_session() as session:
-        request: Request | None = session.exec(
+    async with EngineProvider.get_async_session() as session:
+        request: Request | None = (await session.exec(
             select(  # noqa
                 Request
             ).where(
@@ -227,11 +227,12 @@ async def pick_random_request(invoking_trainee: Member) -> RandomPickedRequest |
                     select(RequestReview.request_id).where(RequestReview.author_user_id == invoking_trainee.id, RequestReview.request_id != None)  # noqa
                 ),
                 Request.details_message_id != None,  # noqa
-                Request.details_message_channel_id != None  # noqa
+                Request.details_message_channel_id != None,  # noqa
+                Request.is_details_message_deleted == False  # noqa
             ).order_by(
                 func.random()
             )
-        ).first()
+        )).first()
 
         if not request:
             return None
@@ -241,7 +242,7 @@ async def pick_random_request(invoking_trainee: Member) -> RandomPickedRequest |
             request.details_message_id = None
             request.details_message_channel_id = None
             session.add(request)
-            session.commit()
+            await session.commit()
             return None
 
     embed = details_message.embeds[0]
@@ -37,15 +37,22 @@ from config.permission_flags import validate as validate_permission_flags
 from db import EngineProvider
 from db.models import RouteID, Request
 from util.datatypes import Language, Opinion
+from facades.eventlog import EVENT_LOG_WRITER
 from facades.reports import stream_results_chart, StreamResolution
-from facades.requests import add_opinion, complete_request, create_limbo_request, get_existing_opinion, get_latest_pending_request, get_pending_request, is_request_unresolved, resolve
+from facades.requests import add_opinion, complete_request, count_pending_requests, create_limbo_request, get_existing_opinion, get_latest_pending_request, get_pending_request, is_request_unresolved, resolve
+from facades.texts import get_overrides_revision
 from globalconf import CONFIG
-from services.disc import post_raw_text
+from services.disc import OUTBOUND_DISPATCHER, forget_message, post_raw_text
+from services.gd import get_levels
 from util.datatypes import SendType, Stage
 from util.identifiers import StageParameterID
 from util.translator import Translator
 
 
+HTTP_CONNECTION_LIMIT = 20
+HTTP_KEEPALIVE_TIMEOUT = 60
+
+
 class StreamAnnouncementPayload(BaseModel):
     text: str = PydanticField(..., min_length=1, max_length=2000)
 
@@ -119,6 +126,13 @@ async def oldest_request(key: str = Depends(header_scheme)) -> Request:
     return await get_pending_request(oldest=True)
 
 
+@api_app.get("/request/pending_count")
+async def pending_request_count(key: str = Depends(header_scheme)) -> int:
+    if key != os.getenv("API_TOKEN"):
+        raise HTTPException(status_code=401, detail="Wrong token")
+    return await count_pending_requests()
+
+
 @api_app.post("/request/resolve")
 async def request_resolve(payload: RequestResolutionPayload, key: str = Depends(header_scheme)) -> bool:
     if key != os.getenv("API_TOKEN"):
@@ -192,6 +206,9 @@ async def request_create_batch(payload: list[RequestCreationPayload], key: str =
     if key != os.getenv("API_TOKEN"):
         raise HTTPException(status_code=401, detail="Wrong token")
 
+    # Warming up the level cache so that each request creation doesn't have to make its own GD API call
+    await get_levels((single_request_payload.level_id for single_request_payload in payload), is_warm_up=True)
+
     for single_request_payload in payload:
         await create_single_request(single_request_payload, True)
 
@@ -208,7 +225,7 @@ class RequestBot(commands.Bot):
         self.logger.setLevel(logging.DEBUG)
 
         self.ext_dir = "cogs"
-        self.synced = False
+        self.synced_overrides_revision: int | None = None
         self.guild_id = 0
 
         intents = discord.Intents.default()
@@ -240,29 +257,48 @@ class RequestBot(commands.Bot):
                 except commands.ExtensionError:
                     self.logger.error(f"Failed to load extension {filename[:-3]}\n{traceback.format_exc()}")
 
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        forget_message(payload.channel_id, payload.message_id, deleted=True)
+
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        for message_id in payload.message_ids:
+            forget_message(payload.channel_id, message_id, deleted=True)
+
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        forget_message(payload.channel_id, payload.message_id, deleted=False, edited_at=discord.utils.parse_time(payload.data.get("edited_timestamp")))
+
     async def on_error(self, event_method: str, *args: tp.Any, **kwargs: tp.Any) -> None:
         self.logger.error(f"An error occurred in {event_method}.\n{traceback.format_exc()}")
 
     async def close(self) -> None:
+        await EVENT_LOG_WRITER.close()
+        await OUTBOUND_DISPATCHER.close()
         await super().close()
         await self.client.close()
 
     async def sync_tree(self) -> None:
         guild = discord.Object(id=self.guild_id)
 
-        if not self.synced:
+        overrides_revision = get_overrides_revision()
+
+        if self.synced_overrides_revision is None:
             self.tree.copy_global_to(guild=guild)
             self.logger.info("Tree copied")
             await self.tree.set_translator(Translator())
             self.logger.info("Translator set")
+        if self.synced_overrides_revision != overrides_revision:
+            # The translations of the command names and descriptions depend on the text overrides
             result = await self.tree.sync(guild=guild)
             self.logger.info(f"Synced command tree: {len(result)} cogs")
-            self.synced = not self.synced
+            self.synced_overrides_revision = overrides_revision
         else:
             self.logger.info("Skipped syncing command tree")
 
     async def setup_hook(self) -> None:
-        self.client = aiohttp.ClientSession()
+        self.client = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT, keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT)
+        )
+        EVENT_LOG_WRITER.start()
         await self._load_extensions()
 
         self.guild_id = get_stage_parameter_value(StageParameterID.GUILD_ID)
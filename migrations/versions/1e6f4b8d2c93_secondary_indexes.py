@@ -0,0 +1,56 @@
+import sqlmodel
+
+"""secondary indexes
+
+Revision ID: 1e6f4b8d2c93
+Revises: c7d3e92a5f18
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e6f4b8d2c93'
+down_revision: Union[str, None] = 'c7d3e92a5f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_loggedevent_event_type_timestamp_id', 'loggedevent', ['event_type', 'timestamp', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_loggedevent_user_id_timestamp_id', 'loggedevent', ['user_id', 'timestamp', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_cooldown_ends_at', 'cooldown', ['ends_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_cooldown_entity_ends_at_entity_id', 'cooldown', ['entity', 'ends_at', 'entity_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_cooldown_entity_casted_at_entity_id', 'cooldown', ['entity', 'casted_at', 'entity_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_request_level_id_requested_at', 'request', ['level_id', 'requested_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_request_resolution_message_id_requested_at', 'request', ['resolution_message_id', 'requested_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_request_requested_at', 'request', ['requested_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_request_resolved_at', 'request', ['resolved_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_requestopinion_request_id_author_user_id_created_at', 'requestopinion', ['request_id', 'author_user_id', 'created_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_requestopinion_author_user_id_created_at', 'requestopinion', ['author_user_id', 'created_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_requestreview_request_id_author_user_id_created_at', 'requestreview', ['request_id', 'author_user_id', 'created_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_requestreview_author_user_id_created_at_id', 'requestreview', ['author_user_id', 'created_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_requestreview_created_at', 'requestreview', ['created_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_traineereviewopinion_review_id', 'traineereviewopinion', ['review_id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_traineereviewopinion_review_id', table_name='traineereviewopinion')
+    op.drop_index('ix_requestreview_created_at', table_name='requestreview')
+    op.drop_index('ix_requestreview_author_user_id_created_at_id', table_name='requestreview')
+    op.drop_index('ix_requestreview_request_id_author_user_id_created_at', table_name='requestreview')
+    op.drop_index('ix_requestopinion_author_user_id_created_at', table_name='requestopinion')
+    op.drop_index('ix_requestopinion_request_id_author_user_id_created_at', table_name='requestopinion')
+    op.drop_index('ix_request_resolved_at', table_name='request')
+    op.drop_index('ix_request_requested_at', table_name='request')
+    op.drop_index('ix_request_resolution_message_id_requested_at', table_name='request')
+    op.drop_index('ix_request_level_id_requested_at', table_name='request')
+    op.drop_index('ix_cooldown_entity_casted_at_entity_id', table_name='cooldown')
+    op.drop_index('ix_cooldown_entity_ends_at_entity_id', table_name='cooldown')
+    op.drop_index('ix_cooldown_ends_at', table_name='cooldown')
+    op.drop_index('ix_loggedevent_user_id_timestamp_id', table_name='loggedevent')
+    op.drop_index('ix_loggedevent_event_type_timestamp_id', table_name='loggedevent')
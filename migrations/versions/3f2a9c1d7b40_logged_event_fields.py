@@ -0,0 +1,47 @@
+import sqlmodel
+
+"""logged event fields
+
+Revision ID: 3f2a9c1d7b40
+Revises: 
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b40'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The table may have already been created by SQLModel.metadata.create_all()
+    if not sa.inspect(op.get_bind()).has_table('loggedeventfield'):
+        op.create_table(
+            'loggedeventfield',
+            sa.Column('event_id', sa.Integer(), nullable=False),
+            sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column('value', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.ForeignKeyConstraint(['event_id'], ['loggedevent.id']),
+            sa.PrimaryKeyConstraint('event_id', 'key')
+        )
+        op.create_index('ix_loggedeventfield_key_value', 'loggedeventfield', ['key', 'value', 'event_id'], unique=False)
+
+    op.execute(
+        """
+        INSERT OR IGNORE INTO loggedeventfield (event_id, key, value)
+        SELECT loggedevent.id, json_each.key, CAST(json_each.value AS TEXT)
+        FROM loggedevent, json_each(loggedevent.custom_data)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_loggedeventfield_key_value', table_name='loggedeventfield')
+    op.drop_table('loggedeventfield')
@@ -0,0 +1,28 @@
+import sqlmodel
+
+"""reviewer opinions index
+
+Revision ID: 4a8e1f6c3d27
+Revises: 9d4c7a2e6b15
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a8e1f6c3d27'
+down_revision: Union[str, None] = '9d4c7a2e6b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_requestopinion_author_user_id_opinion_request_id_created_at', 'requestopinion', ['author_user_id', 'opinion', 'request_id', 'created_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_requestopinion_author_user_id_opinion_request_id_created_at', table_name='requestopinion')
@@ -0,0 +1,33 @@
+import sqlmodel
+
+"""review message tombstone
+
+Revision ID: 5b9e2f7a1c64
+Revises: 1e6f4b8d2c93
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e2f7a1c64'
+down_revision: Union[str, None] = '1e6f4b8d2c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The column may have already been created by SQLModel.metadata.create_all()
+    existing_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('requestreview')}
+    if 'is_message_deleted' not in existing_columns:
+        with op.batch_alter_table('requestreview') as batch_op:
+            batch_op.add_column(sa.Column('is_message_deleted', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('requestreview') as batch_op:
+        batch_op.drop_column('is_message_deleted')
@@ -0,0 +1,28 @@
+import sqlmodel
+
+"""logged event seek index
+
+Revision ID: 8b51e0c4a9d2
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b51e0c4a9d2'
+down_revision: Union[str, None] = '3f2a9c1d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_loggedevent_timestamp_id', 'loggedevent', ['timestamp', 'id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_loggedevent_timestamp_id', table_name='loggedevent')
@@ -0,0 +1,33 @@
+import sqlmodel
+
+"""request details message tombstone
+
+Revision ID: 9d4c7a2e6b15
+Revises: 5b9e2f7a1c64
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4c7a2e6b15'
+down_revision: Union[str, None] = '5b9e2f7a1c64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The column may have already been created by SQLModel.metadata.create_all()
+    existing_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('request')}
+    if 'is_details_message_deleted' not in existing_columns:
+        with op.batch_alter_table('request') as batch_op:
+            batch_op.add_column(sa.Column('is_details_message_deleted', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('request') as batch_op:
+        batch_op.drop_column('is_details_message_deleted')
@@ -0,0 +1,64 @@
+import sqlmodel
+
+"""request state
+
+Revision ID: c7d3e92a5f18
+Revises: 8b51e0c4a9d2
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d3e92a5f18'
+down_revision: Union[str, None] = '8b51e0c4a9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The columns may have already been created by SQLModel.metadata.create_all()
+    existing_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('request')}
+    with op.batch_alter_table('request') as batch_op:
+        if 'resolved_at' not in existing_columns:
+            batch_op.add_column(sa.Column('resolved_at', sa.DateTime(), nullable=True))
+        if 'state' not in existing_columns:
+            batch_op.add_column(sa.Column('state', sa.Enum('LIMBO', 'PENDING', 'APPROVED', 'REJECTED', name='requeststate'), nullable=False, server_default='LIMBO'))
+
+    op.execute(
+        """
+        UPDATE request SET
+            resolved_at = (
+                SELECT MIN(requestopinion.created_at)
+                FROM requestopinion
+                WHERE requestopinion.request_id = request.id AND requestopinion.is_resolution
+            ),
+            state = CASE
+                WHEN EXISTS (
+                    SELECT 1 FROM requestopinion
+                    WHERE requestopinion.request_id = request.id AND requestopinion.is_resolution AND requestopinion.opinion = 'APPROVED'
+                ) THEN 'APPROVED'
+                WHEN EXISTS (
+                    SELECT 1 FROM requestopinion
+                    WHERE requestopinion.request_id = request.id AND requestopinion.is_resolution
+                ) THEN 'REJECTED'
+                WHEN request.requested_at IS NOT NULL THEN 'PENDING'
+                ELSE 'LIMBO'
+            END
+        """
+    )
+
+    op.create_index('ix_request_state_requested_at', 'request', ['state', 'requested_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_request_level_id_state', 'request', ['level_id', 'state'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_request_level_id_state', table_name='request')
+    op.drop_index('ix_request_state_requested_at', table_name='request')
+    with op.batch_alter_table('request') as batch_op:
+        batch_op.drop_column('state')
+        batch_op.drop_column('resolved_at')
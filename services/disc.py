@@ -1,17 +1,23 @@
+import asyncio
+import time
+import traceback
+from collections import OrderedDict
 from dataclasses import dataclass
-from enum import Enum, auto
+from datetime import datetime
+from enum import Enum, IntEnum, auto
+from itertools import count
 from os import PathLike
 from typing import assert_never
 
 import discord
-from discord import Embed, File, Forbidden, Interaction, InteractionResponse, Locale, Member, Message, NotFound, Role
+from discord import DMChannel, Embed, File, Forbidden, Interaction, InteractionResponse, Locale, Member, Message, NotFound, Role, User
 from discord.app_commands import commands
 from discord.ui import Modal
 
 from config.stage_parameters import get_value as get_stage_parameter_value
 from globalconf import CONFIG
 from facades.permissions import has_permission
-from facades.routes import get_channel_id, is_enabled
+from facades.routes import resolve as resolve_route
 from facades.texts import render_text
 from facades.user_preferences import get_value as get_preference_value
 from util.datatypes import Language
@@ -24,6 +30,23 @@ import typing as tp
 
 MESSAGE_LENGTH_LIMIT = 2000
 MAX_SPLIT_MESSAGE_PORTIONS = 10
+FIND_MESSAGES_CONCURRENCY = 4
+FETCH_USERS_CONCURRENCY = 4
+QUERY_MEMBERS_BATCH_SIZE = 100  # Gateway limit for a single member chunk request
+MERGED_MESSAGE_SEPARATOR = "\n"
+
+
+class MessagePriority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+ROUTE_PRIORITIES: dict[RouteID, MessagePriority] = {
+    RouteID.LOG: MessagePriority.LOW,
+    RouteID.APPROVAL_NOTIFICATION: MessagePriority.HIGH,
+    RouteID.REJECTION_NOTIFICATION: MessagePriority.HIGH,
+}
 
 
 @dataclass
@@ -32,6 +55,173 @@ class MemberLanguageInfo:
     is_assumed: bool
 
 
+@dataclass
+class CachedMessage:
+    message: Message | None  # None means the message is confirmed to be deleted
+    cached_at: float
+
+
+class MessageCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 600):
+        self.entries: OrderedDict[tuple[int, int], CachedMessage] = OrderedDict()
+        self.max_size = max_size
+        self.ttl = ttl
+
+    def get(self, channel_id: int, message_id: int) -> CachedMessage | None:
+        key = (channel_id, message_id)
+        entry = self.entries.get(key)
+        # Deleted messages never come back, so the negative entries don't expire
+        if entry and (not entry.message or time.monotonic() - entry.cached_at < self.ttl):
+            self.entries.move_to_end(key)
+            return entry
+        return None
+
+    def put(self, channel_id: int, message_id: int, message: Message | None) -> None:
+        key = (channel_id, message_id)
+        self.entries[key] = CachedMessage(message, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, channel_id: int, message_id: int) -> None:
+        self.entries.pop((channel_id, message_id), None)
+
+
+@dataclass
+class CachedUser:
+    user: User | Member | None  # None means there is no such user (or, for the member cache, they are not in the guild)
+    cached_at: float
+
+
+class UserCache:
+    def __init__(self, max_size: int = 4096, ttl: float = 600, not_found_ttl: float = 600):
+        self.entries: OrderedDict[int, CachedUser] = OrderedDict()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.not_found_ttl = not_found_ttl
+
+    def get(self, user_id: int) -> CachedUser | None:
+        entry = self.entries.get(user_id)
+        if entry and time.monotonic() - entry.cached_at < (self.ttl if entry.user else self.not_found_ttl):
+            self.entries.move_to_end(user_id)
+            return entry
+        return None
+
+    def put(self, user_id: int, user: User | Member | None) -> None:
+        self.entries[user_id] = CachedUser(user, time.monotonic())
+        self.entries.move_to_end(user_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+@dataclass
+class OutboundMessage:
+    channel: discord.abc.Messageable
+    priority: MessagePriority
+    text: str | None
+    view: discord.ui.View | None
+    embed: Embed | None
+    file_path: str | None
+    future: asyncio.Future[Message | None]
+
+    def is_mergeable(self) -> bool:
+        return self.priority == MessagePriority.LOW and bool(self.text) and not (self.view or self.embed or self.file_path) and len(self.text) <= MESSAGE_LENGTH_LIMIT
+
+
+class OutboundDispatcher:
+    """
+    Sends every post through a per-channel queue, so that the channels don't compete for the rate limits inline: higher priority messages jump the queue, adjacent low priority text messages are merged into one
+    """
+    def __init__(self) -> None:
+        self.queues: dict[int, asyncio.PriorityQueue[tuple[MessagePriority, int, OutboundMessage]]] = {}
+        self.workers: dict[int, asyncio.Task] = {}
+        self.sequence = count()  # Keeps the messages of the same priority in the order of submission
+
+    def submit(
+        self,
+        channel: discord.abc.Messageable,
+        priority: MessagePriority,
+        text: str | None = None,
+        view: discord.ui.View | None = None,
+        embed: Embed | None = None,
+        file_path: str | None = None
+    ) -> asyncio.Future[Message | None]:
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.get(channel.id)
+        if queue is None:
+            queue = self.queues[channel.id] = asyncio.PriorityQueue()
+            self.workers[channel.id] = asyncio.create_task(self._work(queue))
+        queue.put_nowait((priority, next(self.sequence), OutboundMessage(channel, priority, text, view, embed, file_path, future)))
+        return future
+
+    async def close(self) -> None:
+        for queue in self.queues.values():
+            await queue.join()
+        for worker in self.workers.values():
+            worker.cancel()
+        self.queues.clear()
+        self.workers.clear()
+
+    @staticmethod
+    def _take_batch(first: OutboundMessage, queue: asyncio.PriorityQueue[tuple[MessagePriority, int, OutboundMessage]]) -> list[OutboundMessage]:
+        batch = [first]
+        if not first.is_mergeable():
+            return batch
+        merged_length = len(first.text)
+        while not queue.empty():
+            item = queue.get_nowait()
+            candidate = item[2]
+            if not candidate.is_mergeable() or merged_length + len(MERGED_MESSAGE_SEPARATOR) + len(candidate.text) > MESSAGE_LENGTH_LIMIT:
+                queue.put_nowait(item)
+                queue.task_done()  # put_nowait() counted the returned item as a new one
+                break
+            batch.append(candidate)
+            merged_length += len(MERGED_MESSAGE_SEPARATOR) + len(candidate.text)
+        return batch
+
+    async def _work(self, queue: asyncio.PriorityQueue[tuple[MessagePriority, int, OutboundMessage]]) -> None:
+        while True:
+            _, _, first = await queue.get()
+            batch = self._take_batch(first, queue)
+            try:
+                text = MERGED_MESSAGE_SEPARATOR.join(outbound.text for outbound in batch) if len(batch) > 1 else first.text
+                message = await _send_portions(first.channel, text, first.view, first.embed, first.file_path)
+            except Exception as error:
+                traceback.print_exc()
+                for outbound in batch:
+                    if not outbound.future.done():
+                        outbound.future.set_exception(error)
+                        outbound.future.exception()  # Marks the exception as retrieved, fire-and-forget senders never await it
+            else:
+                for outbound in batch:
+                    if not outbound.future.done():
+                        outbound.future.set_result(message)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+
+MESSAGE_CACHE = MessageCache()
+MEMBER_CACHE = UserCache()
+USER_CACHE = UserCache()
+OUTBOUND_DISPATCHER = OutboundDispatcher()
+DEVELOPER_DM_CHANNELS: dict[int, DMChannel] = {}
+BACKGROUND_TASKS: set[asyncio.Task] = set()  # Strong references, otherwise the event loop may garbage-collect a pending task
+
+
+def _on_background_task_done(task: asyncio.Task) -> None:
+    BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception():
+        error = task.exception()
+        CONFIG.bot.logger.error(f"A background task failed.\n{''.join(traceback.format_exception(error))}")
+
+
+def run_in_background(coroutine: tp.Coroutine) -> None:
+    task = asyncio.create_task(coroutine)
+    BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_on_background_task_done)
+
+
 class CheckDeferringBehaviour(Enum):
     NO_DEFER = auto()
     DEFER_EPHEMERAL = auto()
@@ -113,19 +303,39 @@ async def respond_forbidden(inter: discord.Interaction) -> None:
     await respond(inter, TextPieceID.ERROR_FORBIDDEN, dict(admin_mention=as_user(get_stage_parameter_value(StageParameterID.ADMIN_USER_ID))), ephemeral=True)
 
 
+async def _get_developer_dm_channel(developer_user_id: int) -> DMChannel | None:
+    dm_channel = DEVELOPER_DM_CHANNELS.get(developer_user_id)
+    if not dm_channel:
+        developer = await find_user(developer_user_id)
+        if not developer:
+            return None
+        dm_channel = developer.dm_channel or await developer.create_dm()
+        DEVELOPER_DM_CHANNELS[developer_user_id] = dm_channel
+    return dm_channel
+
+
 async def send_developers(message: str, code_syntax: str | None = None, file_path: str | PathLike | None = None):
     extra_symbols = 8 + len(code_syntax) if code_syntax is not None else 0  # Triple backtick plus newline at both sides (3+1)*2 = 8
     developer_user_ids: list[int] = get_stage_parameter_value(StageParameterID.DEVELOPER_USER_IDS)
+    portions = [
+        as_code_block(portion, code_syntax or None) if code_syntax is not None else portion
+        for portion in split_message_to_fit_limit(message, extra_symbols)
+    ]
+    dm_channels = [dm_channel for dm_channel in await asyncio.gather(*map(_get_developer_dm_channel, developer_user_ids)) if dm_channel]
+    if not dm_channels or not portions:
+        return
 
-    is_first_portion = True
-    for portion in split_message_to_fit_limit(message, extra_symbols):
-        for developer_user_id in developer_user_ids:
-            developer = await CONFIG.bot.fetch_user(developer_user_id)
-            await developer.send(
-                as_code_block(portion, code_syntax or None) if code_syntax is not None else portion,
-                file=File(file_path) if file_path and is_first_portion else None
-            )
-        is_first_portion = False
+    async def deliver(dm_channel: DMChannel) -> None:
+        # Each recipient gets the portions in order, but the recipients are served concurrently
+        for index, portion in enumerate(portions):
+            # Every recipient gets an upload of their own: attachment URLs are signed and expire, and a DM can't be jumped to by anyone else
+            await dm_channel.send(portion, file=File(file_path) if file_path and index == 0 else None)
+
+    await asyncio.gather(*map(deliver, dm_channels))
+
+
+def send_developers_in_background(message: str, code_syntax: str | None = None, file_path: str | PathLike | None = None) -> None:
+    run_in_background(send_developers(message, code_syntax, file_path))
 
 
 async def safe_defer(inter: discord.Interaction, ephemeral: bool, thinking: bool = True) -> None:
@@ -147,32 +357,56 @@ def requires_permission(permission: PermissionFlagID | list[PermissionFlagID], d
     return commands.check(predicate)
 
 
-async def post_raw_text(
+async def _send_portions(
+    channel: discord.abc.Messageable,
+    text: str | None,
+    view: discord.ui.View | None,
+    embed: Embed | None,
+    file_path: str | None
+) -> Message | None:
+    returned_message = None
+    is_first_portion = True
+    for portion in split_message_to_fit_limit(text or ""):
+        posted_portion = await channel.send(portion, view=view, embed=embed, file=File(file_path) if file_path and is_first_portion else None)
+        if is_first_portion:
+            returned_message = posted_portion
+        is_first_portion = False
+    return returned_message
+
+
+def submit_raw_text(
     route_or_channel_id: RouteID | int,
     text: str | None = None,
     view: discord.ui.View | None = None,
     embed: Embed | None = None,
     file_path: str | None = None
-) -> Message | None:
+) -> asyncio.Future[Message | None]:
     match route_or_channel_id:
         case RouteID():
-            if not is_enabled(route_or_channel_id):
-                return None
-            channel_id = get_channel_id(route_or_channel_id)
+            route = resolve_route(route_or_channel_id)
+            if not route.enabled:
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(None)
+                return future
+            channel = route.channel
+            priority = ROUTE_PRIORITIES.get(route_or_channel_id, MessagePriority.NORMAL)
         case int():
-            channel_id = route_or_channel_id
+            channel = CONFIG.bot.get_channel(route_or_channel_id)
+            priority = MessagePriority.NORMAL
         case _:
             assert_never(route_or_channel_id)
 
-    channel = CONFIG.bot.get_channel(channel_id)
-    returned_message = None
-    is_first_portion = True
-    for portion in split_message_to_fit_limit(text or ""):
-        posted_portion = await channel.send(portion, view=view, embed=embed, file=File(file_path) if file_path and is_first_portion else None)
-        if is_first_portion:
-            returned_message = posted_portion
-        is_first_portion = False
-    return returned_message
+    return OUTBOUND_DISPATCHER.submit(channel, priority, text, view, embed, file_path)
+
+
+async def post_raw_text(
+    route_or_channel_id: RouteID | int,
+    text: str | None = None,
+    view: discord.ui.View | None = None,
+    embed: Embed | None = None,
+    file_path: str | None = None
+) -> Message | None:
+    return await submit_raw_text(route_or_channel_id, text, view, embed, file_path)
 
 
 async def post(
@@ -200,14 +434,77 @@ async def find_message(channel_id: int | None, message_id: int | None) -> Messag
     if not channel_id or not message_id:
         return None
 
+    # discord.py keeps the recently seen messages up to date by itself, so these are safe to return as they are
+    message = discord.utils.get(CONFIG.bot.cached_messages, id=message_id)
+    if message:
+        return message
+
+    cached = MESSAGE_CACHE.get(channel_id, message_id)
+    if cached:
+        return cached.message
+
     channel = CONFIG.bot.get_channel(channel_id)
     if not channel:
         return None
 
     try:
-        return await channel.fetch_message(message_id)
-    except (NotFound, Forbidden):
-        return None
+        message = await channel.fetch_message(message_id)
+    except NotFound:
+        message = None
+    except Forbidden:
+        return None  # Permissions may be restored later, so this is not cached as a deletion
+    MESSAGE_CACHE.put(channel_id, message_id, message)
+    return message
+
+
+def is_message_known_deleted(channel_id: int, message_id: int) -> bool:
+    cached = MESSAGE_CACHE.get(channel_id, message_id)
+    return cached is not None and cached.message is None
+
+
+async def find_messages(references: tp.Iterable[tuple[int | None, int | None]]) -> list[Message | None]:
+    semaphore = asyncio.Semaphore(FIND_MESSAGES_CONCURRENCY)
+
+    async def find_with_limit(channel_id: int | None, message_id: int | None) -> Message | None:
+        async with semaphore:
+            return await find_message(channel_id, message_id)
+
+    return list(await asyncio.gather(*(find_with_limit(channel_id, message_id) for channel_id, message_id in references)))
+
+
+def get_message_url(channel_id: int, message_id: int) -> str:
+    return f"https://discord.com/channels/{CONFIG.guild.id}/{channel_id}/{message_id}"
+
+
+def confirm_messages_exist(references: dict[tp.Hashable, tuple[int, int]], on_missing: tp.Callable[[list[tp.Hashable]], tp.Awaitable[None]]) -> None:
+    # Links are rendered from the stored IDs right away; the deleted messages are discovered afterwards, so that the caller can tombstone them for the next renders.
+    # Only a confirmed deletion counts: an inaccessible message or an uncached channel may well be back later
+    async def confirm() -> None:
+        messages = await find_messages(references.values())
+        missing_keys = [key for (key, reference), message in zip(references.items(), messages) if not message and is_message_known_deleted(*reference)]
+        if missing_keys:
+            await on_missing(missing_keys)
+
+    if references:
+        run_in_background(confirm())
+
+
+async def edit_message(message: Message, **fields: tp.Any) -> Message:
+    edited_message = await message.edit(**fields)
+    MESSAGE_CACHE.put(edited_message.channel.id, edited_message.id, edited_message)
+    return edited_message
+
+
+def forget_message(channel_id: int, message_id: int, deleted: bool, edited_at: datetime | None = None) -> None:
+    if deleted:
+        MESSAGE_CACHE.put(channel_id, message_id, None)
+        return
+
+    # The gateway echoes back the edits made via edit_message() as well, but the cache already holds their result
+    entry = MESSAGE_CACHE.get(channel_id, message_id)
+    if entry and entry.message and entry.message.edited_at and edited_at and entry.message.edited_at >= edited_at:
+        return
+    MESSAGE_CACHE.invalidate(channel_id, message_id)
 
 
 async def safe_delete_message(channel_id: int | None, message_id: int | None) -> None:
@@ -222,13 +519,78 @@ async def safe_delete_message(channel_id: int | None, message_id: int | None) ->
         await message.delete()
     except NotFound:
         pass
+    forget_message(channel_id, message_id, deleted=True)
 
 
-async def find_member(user_id: int) -> Member | None:
+async def _query_members(user_ids: list[int]) -> list[Member]:
     try:
-        return await CONFIG.guild.fetch_member(user_id)
-    except NotFound:
-        return None
+        return await CONFIG.guild.query_members(user_ids=user_ids, limit=len(user_ids))
+    except asyncio.TimeoutError:
+        # The gateway didn't answer in time, so falling back to one REST call per member
+        members = []
+        for user_id in user_ids:
+            try:
+                members.append(await CONFIG.guild.fetch_member(user_id))
+            except NotFound:
+                pass
+        return members
+
+
+async def find_members(user_ids: tp.Iterable[int]) -> dict[int, Member | None]:
+    members = {}
+    missing_user_ids = []
+    for user_id in dict.fromkeys(user_ids):
+        if member := CONFIG.guild.get_member(user_id):
+            members[user_id] = member
+        elif cached := MEMBER_CACHE.get(user_id):
+            members[user_id] = cached.user
+        else:
+            missing_user_ids.append(user_id)
+
+    for batch_start in range(0, len(missing_user_ids), QUERY_MEMBERS_BATCH_SIZE):
+        batch = missing_user_ids[batch_start:batch_start + QUERY_MEMBERS_BATCH_SIZE]
+        found_members = {member.id: member for member in await _query_members(batch)}
+        for user_id in batch:
+            members[user_id] = found_members.get(user_id)
+            MEMBER_CACHE.put(user_id, members[user_id])
+
+    return members
+
+
+async def find_member(user_id: int) -> Member | None:
+    return (await find_members([user_id]))[user_id]
+
+
+async def find_users(user_ids: tp.Iterable[int]) -> dict[int, User | Member | None]:
+    users: dict[int, User | Member | None] = await find_members(user_ids)
+    semaphore = asyncio.Semaphore(FETCH_USERS_CONCURRENCY)
+
+    async def fetch_with_limit(user_id: int) -> None:
+        async with semaphore:
+            try:
+                users[user_id] = await CONFIG.bot.fetch_user(user_id)
+            except NotFound:
+                users[user_id] = None
+        USER_CACHE.put(user_id, users[user_id])
+
+    # Those who aren't members of the guild (anymore) are looked up on the global level
+    missing_user_ids = []
+    for user_id, member in users.items():
+        if member:
+            continue
+        if user := CONFIG.bot.get_user(user_id):
+            users[user_id] = user
+        elif cached := USER_CACHE.get(user_id):
+            users[user_id] = cached.user
+        else:
+            missing_user_ids.append(user_id)
+    await asyncio.gather(*map(fetch_with_limit, missing_user_ids))
+
+    return users
+
+
+async def find_user(user_id: int) -> User | Member | None:
+    return (await find_users([user_id]))[user_id]
 
 
 async def get_role(role_id: int) -> Role | None:
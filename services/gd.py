@@ -1,10 +1,16 @@
 import asyncio
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import StrEnum, IntEnum, Enum, auto
 
-import requests
+import aiohttp
 import typing as tp
-from datetime import datetime, timedelta
+
+from globalconf import CONFIG
+
+
+GET_LEVELS_BATCH_SIZE = 10  # GD returns at most one page (10 levels) per getGJLevels21 call
 
 
 class Endpoint(StrEnum):
@@ -12,6 +18,7 @@ class Endpoint(StrEnum):
 
 
 class LevelFieldKey(IntEnum):
+    LEVEL_ID = 1
     LEVEL_NAME = 2
     AUTHOR_PLAYER_ID = 6
     DIFFICULTY_NUMERATOR = 9
@@ -136,51 +143,223 @@ class Level:
     copied_level_id: int | None
 
 
-class ApiWrapper:
+class LevelFieldClass(Enum):
+    VOLATILE = auto()  # stars, difficulty and grade, which change when a level gets rated
+    STABLE = auto()  # name, author, game version, length and other fields which rarely change
+
+
+@dataclass
+class CachedLevel:
+    level: Level | None  # None means the level wasn't found
+    cached_at: float
+    is_warm_up: bool = False  # Put by a batch warm-up and not read since
+
+
+class LevelCache:
+    def __init__(self, max_size: int = 1024, volatile_ttl: float = 120, stable_ttl: float = 6 * 3600, not_found_ttl: float = 120):
+        self.entries: OrderedDict[int, CachedLevel] = OrderedDict()
+        self.max_size = max_size
+        self.ttls = {
+            LevelFieldClass.VOLATILE: volatile_ttl,
+            LevelFieldClass.STABLE: stable_ttl
+        }
+        self.not_found_ttl = not_found_ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, level_id: int, required_fields: LevelFieldClass) -> CachedLevel | None:
+        entry = self.entries.get(level_id)
+        if entry:
+            # A warm-up may be read long after it happened (e.g. at the end of a long batch), so it's kept until its first read, which re-arms it as usual
+            if entry.is_warm_up:
+                ttl = self.ttls[LevelFieldClass.STABLE]
+            else:
+                ttl = self.ttls[required_fields] if entry.level else self.not_found_ttl
+            if time.monotonic() - entry.cached_at < ttl:
+                if entry.is_warm_up:
+                    entry.cached_at = time.monotonic()
+                    entry.is_warm_up = False
+                self.entries.move_to_end(level_id)
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def put(self, level_id: int, level: Level | None, is_warm_up: bool = False) -> None:
+        self.entries[level_id] = CachedLevel(level, time.monotonic(), is_warm_up)
+        self.entries.move_to_end(level_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, level_id: int) -> None:
+        self.entries.pop(level_id, None)
+
+
+class SingleFlight:
+    """
+    Groups concurrent lookups by key: callers asking for a key that is already being fetched await the same future instead of sending an identical request
+    """
     def __init__(self):
-        self.last_api_call: datetime | None = None
-        self.api_call_lock = asyncio.Lock()
-        self.api_call_interval = timedelta(seconds=0.6)
+        self.futures: dict[tp.Hashable, asyncio.Future] = {}
 
-    async def perform_request(self, endpoint: Endpoint, data: dict) -> str | None:
-        async with self.api_call_lock:
-            if self.last_api_call:
-                time_passed = datetime.now() - self.last_api_call
-                remaining_seconds = (self.api_call_interval - time_passed).total_seconds()
-                if remaining_seconds > 0:
-                    await asyncio.sleep(remaining_seconds)
+    def get(self, key: tp.Hashable) -> asyncio.Future | None:
+        return self.futures.get(key)
+
+    def start(self, keys: tp.Iterable[tp.Hashable]) -> None:
+        loop = asyncio.get_running_loop()
+        for key in keys:
+            self.futures[key] = loop.create_future()
+
+    def finish(self, key: tp.Hashable, result: tp.Any) -> None:
+        self.futures.pop(key).set_result(result)
+
+    def fail(self, keys: tp.Iterable[tp.Hashable], error: BaseException) -> None:
+        for key in keys:
+            future = self.futures.pop(key)
+            if isinstance(error, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(error)
+                future.exception()  # Marks the exception as retrieved in case nobody else awaits this key
 
-            data.update(secret="Wmfd2893gb7")
 
-            response = requests.post(
-                url=endpoint,
-                data=data,
-                headers={"User-Agent": ""}
-            ).text
+class TokenBucket:
+    """
+    Async rate limiter. Each call reserves a token immediately and then sleeps until the reserved token is due, so no lock is held while waiting
+    """
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
 
-            self.last_api_call = datetime.now()
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
 
-            if response == "-1":
-                return None
-            return response
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+
+class ApiWrapper:
+    def __init__(self, api_call_interval: float = 0.6, timeout: float = 10, retries: int = 3, retry_backoff: float = 1):
+        self.rate_limiter = TokenBucket(rate=1 / api_call_interval)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+
+    async def perform_request(self, endpoint: Endpoint, data: dict) -> str | None:
+        data.update(secret="Wmfd2893gb7")
+
+        for attempt in range(self.retries):
+            await self.rate_limiter.acquire()
+            try:
+                async with CONFIG.bot.client.post(url=endpoint, data=data, headers={"User-Agent": ""}, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    text = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.retries - 1:
+                    raise
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+            else:
+                break
+
+        if text == "-1":
+            return None
+        return text
 
 
 API = ApiWrapper()
+LEVEL_CACHE = LevelCache()
+LEVEL_LOOKUPS = SingleFlight()
 
 
-def _get_level_fields(api_response_parts: list[str]) -> dict[int, str]:
-    splitted = api_response_parts[0].split(":")
+def _get_level_fields(level_string: str) -> dict[int, str]:
+    splitted = level_string.split(":")
     return dict(zip(map(int, splitted[::2]), splitted[1::2]))
 
 
-def _get_level_author_name(api_response_parts: list[str]) -> str:
-    creator_string = api_response_parts[1]
-    if not creator_string or ":" not in creator_string:
-        return 'Anonymous Creator'
-    return creator_string.split(":")[1]
+def _get_author_names(creators_string: str) -> dict[int, str]:
+    author_names = {}
+    for creator_string in creators_string.split("|"):
+        splitted = creator_string.split(":")
+        if len(splitted) >= 2:
+            author_names[int(splitted[0])] = splitted[1]
+    return author_names
 
 
-async def get_level(level_id: int) -> Level | None:
+def _parse_levels(raw_response: str) -> dict[int, Level]:
+    response_parts = raw_response.split("#")
+    author_names = _get_author_names(response_parts[1]) if len(response_parts) > 1 else {}
+
+    levels = {}
+    for level_string in response_parts[0].split("|"):
+        level_fields = _get_level_fields(level_string)
+        author_name = author_names.get(int(level_fields.get(LevelFieldKey.AUTHOR_PLAYER_ID, 0)), 'Anonymous Creator')
+        levels[int(level_fields[LevelFieldKey.LEVEL_ID])] = _parse_level(level_fields, author_name)
+    return levels
+
+
+def invalidate_level(level_id: int) -> None:
+    LEVEL_CACHE.invalidate(level_id)
+
+
+async def get_level(level_id: int, required_fields: LevelFieldClass = LevelFieldClass.VOLATILE) -> Level | None:
+    cached = LEVEL_CACHE.get(level_id, required_fields)
+    if cached:
+        return cached.level
+
+    in_flight = LEVEL_LOOKUPS.get(level_id)
+    if in_flight:
+        return await asyncio.shield(in_flight)
+
+    LEVEL_LOOKUPS.start([level_id])
+    try:
+        level = await _fetch_level(level_id)
+    except BaseException as e:
+        LEVEL_LOOKUPS.fail([level_id], e)
+        raise
+
+    LEVEL_CACHE.put(level_id, level)
+    LEVEL_LOOKUPS.finish(level_id, level)
+    return level
+
+
+async def get_levels(level_ids: tp.Iterable[int], required_fields: LevelFieldClass = LevelFieldClass.VOLATILE, is_warm_up: bool = False) -> dict[int, Level | None]:
+    levels = {}
+    in_flight = {}
+    fetched_level_ids = []
+    for level_id in dict.fromkeys(level_ids):
+        cached = LEVEL_CACHE.get(level_id, required_fields)
+        if cached:
+            levels[level_id] = cached.level
+        elif future := LEVEL_LOOKUPS.get(level_id):
+            in_flight[level_id] = future
+        else:
+            fetched_level_ids.append(level_id)
+
+    LEVEL_LOOKUPS.start(fetched_level_ids)
+    try:
+        batches = [fetched_level_ids[i:i + GET_LEVELS_BATCH_SIZE] for i in range(0, len(fetched_level_ids), GET_LEVELS_BATCH_SIZE)]
+        for fetched_levels in await asyncio.gather(*map(_fetch_levels, batches)):
+            levels.update(fetched_levels)
+    except BaseException as e:
+        LEVEL_LOOKUPS.fail(fetched_level_ids, e)
+        raise
+
+    for level_id in fetched_level_ids:
+        LEVEL_CACHE.put(level_id, levels[level_id], is_warm_up)
+        LEVEL_LOOKUPS.finish(level_id, levels[level_id])
+
+    for level_id, future in in_flight.items():
+        levels[level_id] = await asyncio.shield(future)
+
+    return levels
+
+
+async def _fetch_level(level_id: int) -> Level | None:
     raw_response = await API.perform_request(
         Endpoint.GET_LEVELS,
         dict(
@@ -191,10 +370,22 @@ async def get_level(level_id: int) -> Level | None:
     if not raw_response:
         return None
 
-    response_parts = raw_response.split("#")
-    level_fields = _get_level_fields(response_parts)
-    author_name = _get_level_author_name(response_parts)
+    return _parse_levels(raw_response).get(level_id)
+
+
+async def _fetch_levels(level_ids: list[int]) -> dict[int, Level | None]:
+    raw_response = await API.perform_request(
+        Endpoint.GET_LEVELS,
+        dict(
+            type=10,
+            str=",".join(map(str, level_ids))
+        )
+    )
+    fetched_levels = _parse_levels(raw_response) if raw_response else {}
+    return {level_id: fetched_levels.get(level_id) for level_id in level_ids}
+
 
+def _parse_level(level_fields: dict[int, str], author_name: str) -> Level:
     if level_fields.get(LevelFieldKey.AUTO) == '1':
         difficulty = LevelDifficulty.AUTO
     elif level_fields.get(LevelFieldKey.DEMON) == '1':
@@ -0,0 +1,75 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine
+from sqlmodel import SQLModel, Session, create_engine, func, select
+
+from db import EngineProvider
+from db.models import LoggedEvent, Request, RequestOpinion
+from util.datatypes import Language, Opinion, RequestState
+from util.identifiers import LoggedEventTypeID
+
+
+STREAM_NIGHT_REQUESTS = 300
+OPINIONS_PER_REQUEST = 3
+
+
+def simulate_stream_night(engine: Engine) -> tuple[float, float]:
+    """
+    Creates, completes and reviews the requests one commit at a time, the way the facades do, while another thread keeps counting the pending requests.
+    Returns commits/s and concurrent reads/s
+    """
+    SQLModel.metadata.create_all(engine)
+    reads = 0
+    stopped = threading.Event()
+
+    def read_pending_count() -> None:
+        nonlocal reads
+        while not stopped.is_set():
+            with Session(engine) as session:
+                session.exec(select(func.count(Request.id)).where(Request.state == RequestState.PENDING)).one()
+            reads += 1
+
+    reader = threading.Thread(target=read_pending_count)
+    reader.start()
+    commits = 0
+    started_at = time.perf_counter()
+    try:
+        with Session(engine) as session:
+            def commit(*entries) -> None:
+                nonlocal commits
+                session.add_all(entries)
+                session.commit()
+                commits += 1
+
+            def log(event_type: LoggedEventTypeID, user_id: int) -> LoggedEvent:
+                return LoggedEvent(event_type=event_type, user_id=user_id, custom_data="{}")
+
+            for level_id in range(STREAM_NIGHT_REQUESTS):
+                request = Request(level_id=level_id, language=Language.EN, request_author="1")
+                commit(request)
+                commit(log(LoggedEventTypeID.REQUEST_INITIALIZED, 1))
+                request.state = RequestState.PENDING
+                commit(request)
+                commit(log(LoggedEventTypeID.REQUEST_REQUESTED, 1))
+                for reviewer_id in range(OPINIONS_PER_REQUEST):
+                    commit(RequestOpinion(author_user_id=reviewer_id, opinion=Opinion.APPROVED, request_id=request.id))
+                    commit(log(LoggedEventTypeID.REQUEST_OPINION_ADDED, reviewer_id))
+    finally:
+        elapsed = time.perf_counter() - started_at
+        stopped.set()
+        reader.join()
+        engine.dispose()
+    return commits / elapsed, reads / elapsed
+
+
+@pytest.mark.benchmark
+def test_engine_profile_speeds_up_stream_night(tmp_path: Path) -> None:
+    default_commit_rate, default_read_rate = simulate_stream_night(create_engine(f"sqlite:///{tmp_path / 'default.db'}"))
+    profile_commit_rate, profile_read_rate = simulate_stream_night(EngineProvider._create_engine(tmp_path / "profile.db"))
+
+    print(f"\ndefault engine: {default_commit_rate:.0f} commits/s, {default_read_rate:.0f} reads/s")
+    print(f"engine profile: {profile_commit_rate:.0f} commits/s, {profile_read_rate:.0f} reads/s")
+    assert profile_commit_rate > default_commit_rate
@@ -0,0 +1,55 @@
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import Session, SQLModel, col, select
+
+import facades.permissions
+from db import EngineProvider
+from db.models import PermissionFlag
+from facades.permissions import has_permission
+from util.identifiers import PermissionFlagID
+
+
+CHECKS = 5000
+
+
+def has_permission_uncached(member, permission: PermissionFlagID | list[PermissionFlagID], allow_admin: bool = True) -> bool:
+    # The lookup has_permission did before the index: one session and one query per check
+    member_roles = {role.id for role in member.roles}
+    checked_flags = [permission] if isinstance(permission, PermissionFlagID) else list(permission)
+    if allow_admin:
+        checked_flags.append(PermissionFlagID.ADMIN)
+    with EngineProvider.get_session() as session:
+        required_roles = set(session.exec(select(PermissionFlag.role_id).where(col(PermissionFlag.id).in_(checked_flags))))
+    return bool(member_roles & required_roles)
+
+
+@pytest.fixture
+def bound_permissions(tmp_path: Path):
+    previous_engine = EngineProvider.engine
+    EngineProvider.engine = EngineProvider._create_engine(tmp_path / "permissions.db")
+    SQLModel.metadata.create_all(EngineProvider.engine)
+    with Session(EngineProvider.engine) as session:
+        session.add_all([PermissionFlag(id=permission, role_id=100 + index) for index, permission in enumerate(PermissionFlagID)])
+        session.commit()
+    facades.permissions._rebuild_index()
+    yield
+    EngineProvider.engine.dispose()
+    EngineProvider.engine = previous_engine
+    facades.permissions._role_ids_by_permission = None
+
+
+@pytest.mark.benchmark
+def test_indexed_permission_check_skips_database(bound_permissions) -> None:
+    member = SimpleNamespace(roles=[SimpleNamespace(id=role_id) for role_id in (1, 2, 103)])
+    checked_flags = [PermissionFlagID.GD_MOD, PermissionFlagID.BAN_USERS]
+    assert has_permission(member, checked_flags) == has_permission_uncached(member, checked_flags)
+
+    uncached_time = timeit.timeit(lambda: has_permission_uncached(member, checked_flags), number=CHECKS) / CHECKS
+    indexed_time = timeit.timeit(lambda: has_permission(member, checked_flags), number=CHECKS) / CHECKS
+
+    print(f"\nper-call lookup: {uncached_time * 1e6:.1f} us/check")
+    print(f"indexed lookup:  {indexed_time * 1e6:.1f} us/check")
+    assert indexed_time < uncached_time
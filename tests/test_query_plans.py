@@ -0,0 +1,179 @@
+import asyncio
+from datetime import date, datetime, UTC
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+import facades.cooldowns as cooldowns
+import facades.eventlog as eventlog
+import facades.requests as requests
+import facades.reviews as reviews
+import facades.trainee as trainee
+from db import EngineProvider
+from db.models import Request, RequestOpinion, RequestReview
+from facades.eventlog import LoadedLogFilter
+from util.datatypes import CooldownEntity, Language, Opinion, PageCursor, ReportRange, RequestState, Seek, SeekDirection, SimpleReportRange
+from util.identifiers import LoggedEventTypeID
+
+try:
+    import facades.reports as reports
+except ImportError:  # plotly and pandas are only needed by the reports
+    reports = None
+
+
+REPO_DIR = Path(__file__).parent.parent
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+APPROVED_LEVEL_ID = 1
+PENDING_LEVEL_ID = 2
+REVIEWER = SimpleNamespace(id=1, name="reviewer")
+TRAINEE = SimpleNamespace(id=10, name="trainee")
+REPORT_RANGE = ReportRange(date_from=date(2025, 1, 1), date_to=date(2025, 12, 31), weekly_granularity=False)
+SEEKS = {
+    "first page": Seek(),
+    "next page": Seek(PageCursor(NOW, 1)),
+    "previous page": Seek(PageCursor(NOW, 1), SeekDirection.BEFORE),
+}
+
+
+async def _assert_level_requestable(level_id: int) -> None:
+    try:
+        await requests.assert_level_requestable(level_id)
+    except (requests.LevelAlreadyApprovedException, requests.PreviousLevelRequestPendingException):
+        pass
+
+
+# Calls into facades/*, keyed by "<facade function>[: <variant>]"; every SELECT they issue gets its plan checked
+FACADE_CALLS = {
+    "requests.reconcile_pending_count": lambda: requests.reconcile_pending_count(),
+    "requests.assert_level_requestable: approved": lambda: _assert_level_requestable(APPROVED_LEVEL_ID),
+    "requests.assert_level_requestable: not approved": lambda: _assert_level_requestable(PENDING_LEVEL_ID),
+    "requests.get_last_complete_request": lambda: requests.get_last_complete_request(APPROVED_LEVEL_ID),
+    "requests.is_request_unresolved": lambda: requests.is_request_unresolved(1),
+    "requests.get_latest_pending_request": lambda: requests.get_latest_pending_request(PENDING_LEVEL_ID),
+    "requests.get_oldest_ignored_request": lambda: requests.get_oldest_ignored_request(),
+    "requests.get_oldest_unresolved_request": lambda: requests.get_oldest_unresolved_request(),
+    "requests.get_pending_request: oldest": lambda: requests.get_pending_request(True),
+    "requests.get_pending_request: random": lambda: requests.get_pending_request(False),
+    "requests.get_existing_opinion": lambda: requests.get_existing_opinion(REVIEWER, 1),
+    "requests.get_existing_opinion: resolution only": lambda: requests.get_existing_opinion(REVIEWER, 1, resolution_only=True),
+    "requests.get_existing_review": lambda: requests.get_existing_review(REVIEWER, 1),
+    "reviews.get_level_reviews": lambda: reviews.get_level_reviews(PENDING_LEVEL_ID),
+    "trainee.resolve_trainee_review": lambda: trainee.resolve_trainee_review(REVIEWER, 1, True),
+    "trainee.pick_random_request": lambda: trainee.pick_random_request(TRAINEE),
+    "cooldowns.clean_table": lambda: cooldowns.clean_table(),
+    "reports.new_requests": lambda: reports.new_requests(REPORT_RANGE),
+    "reports.pending_requests": lambda: reports.pending_requests(REPORT_RANGE),
+    "reports.reviewer_opinions": lambda: reports.reviewer_opinions(REVIEWER, SimpleReportRange(date_from=REPORT_RANGE.date_from, date_to=REPORT_RANGE.date_to)),
+    "reports.review_activity": lambda: reports.review_activity(REPORT_RANGE),
+}
+for seek_name, seek in SEEKS.items():
+    FACADE_CALLS |= {
+        f"eventlog.get_entries: {seek_name}": lambda seek=seek: eventlog.get_entries(10, seek),
+        f"eventlog.get_entries: {seek_name}, by user": lambda seek=seek: eventlog.get_entries(10, seek, LoadedLogFilter(user_id=1)),
+        f"eventlog.get_entries: {seek_name}, by event type": lambda seek=seek: eventlog.get_entries(10, seek, LoadedLogFilter(event_type=LoggedEventTypeID.PARAMETER_EDITED)),
+        f"eventlog.get_entries: {seek_name}, by custom field": lambda seek=seek: eventlog.get_entries(10, seek, LoadedLogFilter(custom_data_values=dict(target_user_id=1))),
+        f"reviews.get_user_reviews: {seek_name}": lambda seek=seek: reviews.get_user_reviews(TRAINEE, 10, seek),
+        f"cooldowns.list_temporary_cooldowns: {seek_name}": lambda seek=seek: cooldowns.list_temporary_cooldowns(CooldownEntity.USER, 10, seek),
+        f"cooldowns.list_endless_cooldowns: {seek_name}": lambda seek=seek: cooldowns.list_endless_cooldowns(CooldownEntity.USER, 10, seek),
+    }
+
+# Plan steps allowed despite being a SCAN or a USE TEMP B-TREE, with the reason why they are fine
+WHITELIST: dict[str, tuple[set[str], str]] = {
+    "requests.get_pending_request: random": ({"USE TEMP B-TREE FOR ORDER BY"}, "ORDER BY RANDOM() can't be served by an index; only the pending requests get sorted"),
+    "trainee.pick_random_request": (
+        {"SCAN request", "USE TEMP B-TREE FOR ORDER BY"},
+        "ORDER BY RANDOM() can't be served by an index, and almost every request has a details message, so an index on it would not narrow the scan"
+    ),
+    "reviews.get_level_reviews": ({"USE TEMP B-TREE FOR ORDER BY"}, "the reviews of one level span several requests, so they are sorted after being found by request"),
+}
+for seek_name in SEEKS:
+    WHITELIST[f"eventlog.get_entries: {seek_name}, by custom field"] = (
+        {"USE TEMP B-TREE FOR ORDER BY"},
+        "the matching events are found through ix_loggedeventfield_key_value and only they get sorted"
+    )
+WHITELIST["eventlog.get_entries: first page"] = (
+    {"SCAN loggedevent USING INDEX ix_loggedevent_timestamp_id"},
+    "the unfiltered first page walks the log in index order and stops after LIMIT rows"
+)
+
+
+@pytest.fixture(scope="module")
+def migrated_database(tmp_path_factory: pytest.TempPathFactory):
+    previous_state = EngineProvider.engine, EngineProvider.async_engine, EngineProvider.db_path
+    db_path = tmp_path_factory.mktemp("query_plans") / "database.db"
+    EngineProvider.db_path = db_path
+    EngineProvider.engine = EngineProvider._create_engine(db_path)
+    EngineProvider.async_engine = EngineProvider._create_async_engine(db_path)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(REPO_DIR)  # MIGRATIONS_DIR is relative to the repository root
+        EngineProvider._prepare_schema(EngineProvider.engine)
+
+    with Session(EngineProvider.engine) as session:
+        approved_request = Request(level_id=APPROVED_LEVEL_ID, language=Language.EN, request_author="1", requested_at=NOW, resolved_at=NOW, state=RequestState.APPROVED)
+        pending_request = Request(level_id=PENDING_LEVEL_ID, language=Language.EN, request_author="1", requested_at=NOW, state=RequestState.PENDING)
+        session.add_all([approved_request, pending_request])
+        session.flush()
+        session.add(RequestOpinion(author_user_id=REVIEWER.id, opinion=Opinion.APPROVED, is_resolution=True, request_id=approved_request.id))
+        session.add(RequestReview(author_user_id=TRAINEE.id, text="", message_id=1, message_channel_id=1, opinion=Opinion.APPROVED, is_trainee=True, request_id=pending_request.id))
+        session.commit()
+
+    yield
+    EngineProvider.engine.dispose()
+    EngineProvider.engine, EngineProvider.async_engine, EngineProvider.db_path = previous_state
+
+
+@pytest.fixture
+def isolated_facades(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def no_message(*args, **kwargs) -> None:
+        return None
+
+    # Neither Discord nor the event log writer is running here; only the queries matter
+    monkeypatch.setattr(trainee, "find_message", no_message)
+    monkeypatch.setattr(trainee, "add_entry", no_message)
+    if reports:
+        monkeypatch.setattr(reports, "px", MagicMock())
+        monkeypatch.setattr(reports, "pd", MagicMock())
+        monkeypatch.setattr(reports, "get_parameter_value", lambda *args: False)
+
+
+def capture_plans(facade_call) -> dict[str, list[str]]:
+    plans = {}
+
+    def capture_plan(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)  # The aiosqlite cursor adapter returns None here, so the rows are fetched separately
+            plans[statement] = [row[3] for row in cursor.fetchall()]
+
+    async def call() -> None:
+        try:
+            await facade_call()
+        finally:
+            await EngineProvider.async_engine.dispose()  # Its connections are bound to this event loop
+
+    engines = [EngineProvider.engine, EngineProvider.async_engine.sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture_plan)
+    try:
+        asyncio.run(call())
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", capture_plan)
+    return plans
+
+
+@pytest.mark.parametrize("facade_call", [
+    pytest.param(name, marks=pytest.mark.skipif(name.startswith("reports.") and not reports, reason="the reports need plotly and pandas"))
+    for name in FACADE_CALLS
+])
+def test_facade_queries_use_indexes(migrated_database, isolated_facades, facade_call: str) -> None:
+    plans = capture_plans(FACADE_CALLS[facade_call])
+    assert plans, f"{facade_call} issued no SELECT"
+
+    allowed_steps, _ = WHITELIST.get(facade_call, (set(), None))
+    for statement, plan in plans.items():
+        offending_steps = [step for step in plan if (step.startswith("SCAN") or "TEMP B-TREE" in step) and step not in allowed_steps]
+        assert not offending_steps, f"{facade_call} falls back to {offending_steps}\n{statement}\nfull plan: {plan}"
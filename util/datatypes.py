@@ -4,6 +4,7 @@ from enum import auto, Enum, StrEnum, unique
 import discord
 from attr import dataclass
 from discord import app_commands
+from sqlalchemy import tuple_
 
 from util.identifiers import TextPieceID
 from util.time import get_date, to_end_of_week, to_start_of_day, to_start_of_week
@@ -76,6 +77,14 @@ class Opinion(StrEnum):
     REJECTED = auto()
 
 
+@unique
+class RequestState(StrEnum):
+    LIMBO = auto()
+    PENDING = auto()
+    APPROVED = auto()
+    REJECTED = auto()
+
+
 @unique
 class SendType(StrEnum):
     STARRATE = 's'
@@ -148,6 +157,40 @@ class ReportRange(SimpleReportRange):
         return f"{range_info} (per week)" if self.weekly_granularity else range_info
 
 
+@unique
+class SeekDirection(StrEnum):
+    AFTER = auto()
+    BEFORE = auto()
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    sort_key: datetime | int
+    id: int
+
+
+@dataclass(frozen=True)
+class Seek:
+    cursor: PageCursor | None = None
+    direction: SeekDirection = SeekDirection.AFTER
+
+    def restrict_query(self, query, sort_attribute, id_attribute, limit: int, descending: bool = False):
+        # When seeking backwards, the rows closest to the cursor come first; to_page_order() then restores the displayed order
+        reversed_order = (self.direction == SeekDirection.BEFORE) != descending
+        if self.cursor:
+            key = tuple_(sort_attribute, id_attribute)
+            bound = (self.cursor.sort_key, self.cursor.id)
+            query = query.where(key < bound if reversed_order else key > bound)
+        if reversed_order:
+            query = query.order_by(sort_attribute.desc(), id_attribute.desc())
+        else:
+            query = query.order_by(sort_attribute, id_attribute)
+        return query.limit(limit)
+
+    def to_page_order(self, rows: list) -> list:
+        return rows[::-1] if self.direction == SeekDirection.BEFORE else rows
+
+
 class ReportGranularity(StrEnum):
     DAY = "day"
     WEEK = "week"
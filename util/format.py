@@ -44,6 +44,17 @@ def as_timestamp(ts: int | float | datetime, style: TimestampStyle = TimestampSt
     return f'<t:{unix_secs}:{style.value}>'
 
 
+def as_file_size(size_bytes: int) -> str:
+    if size_bytes < 1024:
+        return f'{size_bytes} B'
+    size = size_bytes / 1024
+    for unit in ('KiB', 'MiB'):
+        if size < 1024:
+            return f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GiB'
+
+
 def as_user(user_id: int) -> str:
     return f'<@{user_id}>'
 